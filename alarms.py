@@ -0,0 +1,208 @@
+"""Много таймеров и будильников сразу: очередь ближайших срабатываний.
+
+Сроки лежат в двух кучах (heapq): таймеры — по монотонной шкале
+``timebase.now_ns``, будильники — по настенному времени (им важно
+«в 07:30 по часам», даже если компьютер спал или часы перевели).
+Вершины куч — ближайшие сроки, поэтому приложение просыпается ровно к
+следующему срабатыванию, не опрашивая каждый таймер на каждом тике.
+
+Отменённые записи из куч не выковыриваются, а помечаются и
+выбрасываются, когда доходят до вершины (или при пересборке кучи,
+если мусора накопилось больше половины).
+"""
+
+import datetime
+import heapq
+import itertools
+import time
+
+from timebase import NS_PER_SEC, now_ns
+
+TIMER = "timer"
+ALARM = "alarm"
+
+
+def next_occurrence(hms, after_ts):
+    """Ближайший после after_ts момент, когда на часах hms (ч, м, с)."""
+    after = datetime.datetime.fromtimestamp(after_ts)
+    h, m, s = hms
+    when = after.replace(hour=h, minute=m, second=s, microsecond=0)
+    if when.timestamp() <= after_ts:
+        # Через дату, а не +86400 с: переход на летнее время не сдвигает
+        when = datetime.datetime.combine(
+            after.date() + datetime.timedelta(days=1), when.time()
+        )
+    return when.timestamp()
+
+
+class Entry:
+    __slots__ = ("name", "kind", "deadline", "period_ns", "hms", "repeat",
+                 "active", "fired")
+
+    def __init__(self, name, kind, deadline, period_ns=0, hms=None,
+                 repeat=False):
+        self.name = name
+        self.kind = kind
+        # Таймер — now_ns() срабатывания, будильник — time.time()
+        self.deadline = deadline
+        self.period_ns = period_ns
+        self.hms = hms
+        self.repeat = repeat
+        self.active = True
+        self.fired = 0
+
+    def remaining(self, now=None, now_ts=None):
+        """Секунд до срабатывания (может быть меньше нуля)."""
+        if self.kind == TIMER:
+            now = now_ns() if now is None else now
+            return (self.deadline - now) / NS_PER_SEC
+        now_ts = time.time() if now_ts is None else now_ts
+        return self.deadline - now_ts
+
+
+class AlarmQueue:
+    def __init__(self):
+        self._heaps = {TIMER: [], ALARM: []}
+        self._seq = itertools.count()
+        self._stale = 0
+        self.entries = {}  # {имя: Entry}
+
+    def __len__(self):
+        return len(self.entries)
+
+    # ---------- добавление и отмена ----------
+
+    def add_timer(self, name, duration_ns, repeat=False, now=None):
+        """Обратный отсчёт; с repeat — снова и снова с тем же периодом."""
+        if repeat and duration_ns <= 0:
+            raise ValueError("повторяющийся таймер с нулевым периодом")
+        now = now_ns() if now is None else now
+        entry = Entry(name, TIMER, now + duration_ns,
+                      period_ns=duration_ns if repeat else 0, repeat=repeat)
+        return self._add(entry)
+
+    def add_alarm(self, name, hms, repeat=False, now_ts=None):
+        """Будильник на время суток hms; с repeat — каждый день."""
+        now_ts = time.time() if now_ts is None else now_ts
+        entry = Entry(name, ALARM, next_occurrence(hms, now_ts),
+                      hms=hms, repeat=repeat)
+        return self._add(entry)
+
+    def _add(self, entry):
+        # Одноимённая запись заменяется новой
+        self.cancel(entry.name)
+        self.entries[entry.name] = entry
+        self._push(entry)
+        return entry
+
+    def _push(self, entry):
+        heapq.heappush(self._heaps[entry.kind],
+                       (entry.deadline, next(self._seq), entry))
+
+    def cancel(self, name):
+        entry = self.entries.pop(name, None)
+        if entry is None:
+            return False
+        entry.active = False
+        self._stale += 1
+        if self._stale > len(self.entries):
+            self._compact()
+        return True
+
+    def _compact(self):
+        for kind, heap in self._heaps.items():
+            heap[:] = [item for item in heap if item[2].active]
+            heapq.heapify(heap)
+        self._stale = 0
+
+    # ---------- срабатывания ----------
+
+    def _top(self, kind):
+        heap = self._heaps[kind]
+        while heap and not heap[0][2].active:
+            heapq.heappop(heap)
+            self._stale -= 1
+        return heap[0][2] if heap else None
+
+    def next_in(self, now=None, now_ts=None):
+        """Секунд до ближайшего срабатывания или None, если ждать нечего."""
+        waits = [
+            entry.remaining(now, now_ts)
+            for entry in (self._top(TIMER), self._top(ALARM))
+            if entry is not None
+        ]
+        return min(waits) if waits else None
+
+    def pop_due(self, now=None, now_ts=None):
+        """Сработавшие записи; повторяющиеся уже переставлены дальше."""
+        now = now_ns() if now is None else now
+        now_ts = time.time() if now_ts is None else now_ts
+        fired = []
+        for kind in (TIMER, ALARM):
+            heap = self._heaps[kind]
+            while True:
+                entry = self._top(kind)
+                if entry is None or entry.remaining(now, now_ts) > 0:
+                    break
+                heapq.heappop(heap)
+                entry.fired += 1
+                fired.append(entry)
+                if not entry.repeat:
+                    entry.active = False
+                    del self.entries[entry.name]
+                    continue
+                if kind == TIMER:
+                    # Пропущенные периоды (сон, перегрузка) не догоняем
+                    late = now - entry.deadline
+                    entry.deadline += (late // entry.period_ns + 1) * \
+                        entry.period_ns
+                else:
+                    entry.deadline = next_occurrence(entry.hms, now_ts)
+                self._push(entry)
+        return fired
+
+    # ---------- для списка на экране ----------
+
+    def upcoming(self, count, now=None, now_ts=None):
+        """Ближайшие count записей: [(секунд осталось, Entry), ...]."""
+        now = now_ns() if now is None else now
+        now_ts = time.time() if now_ts is None else now_ts
+        items = []
+        for heap in self._heaps.values():
+            items.extend(
+                (item[2].remaining(now, now_ts), item[1], item[2])
+                for item in heapq.nsmallest(
+                    count, (i for i in heap if i[2].active)
+                )
+            )
+        items.sort()
+        return [(left, entry) for left, _, entry in items[:count]]
+
+
+def load_timers(path, queue):
+    """Строки «timer|alarm;имя;ЧЧ:ММ:СС[;repeat]» из файла в очередь.
+
+    Пустые строки и строки с # пропускаются; возвращает число записей.
+    Повторяющийся таймер с нулевым периодом — ValueError.
+    """
+    count = 0
+    with open(path, encoding="utf-8") as f:
+        for number, line in enumerate(f, 1):
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            kind, name, hms, *rest = [part.strip() for part in line.split(";")]
+            repeat = bool(rest) and rest[0].lower() in ("repeat", "1", "yes")
+            h, m, s = (int(part) for part in hms.split(":"))
+            if kind == ALARM:
+                queue.add_alarm(name, (h, m, s), repeat=repeat)
+            else:
+                total = h * 3600 + m * 60 + s
+                if repeat and total <= 0:
+                    raise ValueError(
+                        f"{path}:{number}: повторяющийся таймер «{name}» "
+                        f"с нулевым периодом"
+                    )
+                queue.add_timer(name, total * NS_PER_SEC, repeat=repeat)
+            count += 1
+    return count
@@ -0,0 +1,357 @@
+"""Замеры производительности: перерисовка, тики, число элементов, джиттер.
+
+Два режима:
+  * tk       — настоящий Tk (нужен дисплей; --xvfb поднимет Xvfb сам);
+  * headless — без дисплея, через offscreen-растеризатор; джиттер
+    здесь синтетический (цикл на time.sleep вместо Tk).
+
+Результат пишется в JSON. С --baseline сравниваем с сохранёнными
+замерами и выходим с кодом 1, если что-то стало хуже больше чем на
+--threshold процентов.
+
+    python bench.py --xvfb -o bench.json
+    python bench.py --baseline bench_baseline.json --threshold 25
+    python bench.py --save-baseline bench_baseline.json
+"""
+
+import argparse
+import datetime
+import heapq
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from types import SimpleNamespace
+
+from frame import frame_batch
+from instrument import Metrics
+from scheduler import TickScheduler
+from themes import DEFAULT_THEME
+
+SIZES = (250, 500, 1000)
+
+
+def timeit_ms(fn, repeat):
+    """Медиана времени одного вызова, мс."""
+    samples = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - t0) * 1000)
+    return statistics.median(samples)
+
+
+def moving_times(count):
+    """Разные моменты времени, чтобы стрелки действительно двигались."""
+    start = datetime.datetime(2024, 1, 1, 10, 8, 30)
+    return [start + datetime.timedelta(seconds=i * 7.3) for i in range(count)]
+
+
+# ---------------------------------------------------------
+# Джиттер планировщика
+# ---------------------------------------------------------
+
+class SleepLoop:
+    """Минимальная замена after()/mainloop() для режима без Tk."""
+
+    def __init__(self):
+        self._queue = []
+        self._seq = 0
+
+    def after(self, ms, func):
+        self._seq += 1
+        heapq.heappush(
+            self._queue, (time.monotonic() + ms / 1000, self._seq, func)
+        )
+        return self._seq
+
+    def after_idle(self, func):
+        return self.after(0, func)
+
+    def after_cancel(self, job):
+        self._queue = [e for e in self._queue if e[1] != job]
+        heapq.heapify(self._queue)
+
+    def run(self, duration):
+        end = time.monotonic() + duration
+        while self._queue and time.monotonic() < end:
+            when, _, func = heapq.heappop(self._queue)
+            delay = when - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+            func()
+
+
+def bench_jitter(widget, run, period_ms=40, duration=2.0,
+                 prefix="scheduler"):
+    ticker = TickScheduler(widget, lambda: None, period_ms=period_ms,
+                           align=True)
+    ticker.start()
+    run(duration)
+    ticker.stop()
+    stats = ticker.jitter_stats()
+    return {
+        f"{prefix}.jitter_p95_ms": stats["p95_ms"],
+        f"{prefix}.jitter_max_ms": stats["max_ms"],
+        f"{prefix}.skipped": stats["skipped"],
+    }
+
+
+# ---------------------------------------------------------
+# Режим без дисплея
+# ---------------------------------------------------------
+
+def bench_headless(sizes, repeat, duration):
+    from dial import dial_ppm
+    from offscreen import render_face
+
+    results = {}
+    for size in sizes:
+        radius = size / 2 - 10
+        font_px = max(int(size / 18), 8)
+        results[f"dial_ppm@{size}"] = timeit_ms(
+            lambda: dial_ppm(int(radius), font_px), max(repeat // 5, 1)
+        )
+        results[f"render_face@{size}"] = timeit_ms(
+            lambda: render_face(size), max(repeat // 5, 1)
+        )
+
+    # Джиттер здесь — цикла на time.sleep, а не Tk: только синтетическая
+    # проверка самого планировщика, настоящий джиттер — в режиме tk
+    loop = SleepLoop()
+    results.update(bench_jitter(loop, loop.run, duration=duration,
+                                prefix="synthetic.scheduler"))
+    return results
+
+
+# ---------------------------------------------------------
+# Режим с Tk
+# ---------------------------------------------------------
+
+def bench_tk(sizes, repeat, duration):
+    import tkinter as tk
+
+    import last
+    from dial import dial_cache
+    from diskcache import DiskCache
+    from face import CARD_STYLE, WINDOW_STYLE, ClockFace
+    from geometry import hand_turns
+
+    # Свой каталог на время замеров: кэш пользователя не трогаем
+    dial_cache.disk = DiskCache(tempfile.mkdtemp(prefix="clock-bench-"),
+                                namespace=dial_cache.disk.namespace)
+
+    root = tk.Tk()
+    results = {}
+
+    # draw_static() из clock-plusresize.py — это ClockFace.layout()
+    # с пропорциями окна; скрипт целиком не импортируется (mainloop)
+    for name, style in (("draw_static", WINDOW_STYLE),
+                        ("face_layout", CARD_STYLE)):
+        for size in sizes:
+            top = tk.Toplevel(root)
+            canvas = tk.Canvas(top, width=size, height=size,
+                               highlightthickness=0)
+            canvas.pack()
+            face = ClockFace(canvas, **style)
+
+            def cold():
+                dial_cache.clear(disk=True)
+                face.layout(size, size, force=True)
+
+            def disk():
+                dial_cache.clear()
+                face.layout(size, size, force=True)
+
+            # Картинку рисует фоновый поток: cold — цена для потока Tk,
+            # а сама отрисовка — dial_ppm в режиме без Tk
+            results[f"{name}.cold@{size}"] = timeit_ms(
+                cold, max(repeat // 5, 1)
+            )
+            dial_cache.finish()
+            results[f"{name}.disk@{size}"] = timeit_ms(
+                disk, max(repeat // 5, 1)
+            )
+            results[f"{name}.warm@{size}"] = timeit_ms(
+                lambda: face.layout(size, size, force=True), repeat
+            )
+            results[f"{name}.items@{size}"] = len(canvas.find_all())
+
+            if name == "draw_static" and size == sizes[len(sizes) // 2]:
+                # update_clock(): один кадр стрелок
+                times = iter(moving_times(repeat))
+                results["update_clock"] = timeit_ms(
+                    lambda: face.set_hands(*hand_turns(next(times))), repeat
+                )
+            top.destroy()
+
+    # AnalogClockCard.redraw() на карточке заданного размера
+    for size in sizes:
+        top = tk.Toplevel(root)
+        top.geometry(f"{size}x{size}")
+        # Карточке от приложения нужны только замеры (выключенные), тема
+        # и пакет Tcl-команд кадра
+        card = last.AnalogClockCard(
+            top, SimpleNamespace(metrics=Metrics(), theme=DEFAULT_THEME,
+                                 sweep=False, frame=frame_batch(top))
+        )
+        card.pack(fill="both", expand=True)
+        top.update()
+        card.redraw_scheduler.cancel()
+
+        def cold():
+            dial_cache.clear(disk=True)
+            card.face.laid_out = None
+            card.redraw()
+
+        def warm():
+            card.face.laid_out = None
+            card.redraw()
+
+        results[f"analog_card.redraw.cold@{size}"] = timeit_ms(
+            cold, max(repeat // 5, 1)
+        )
+        dial_cache.finish()
+        results[f"analog_card.redraw.warm@{size}"] = timeit_ms(warm, repeat)
+        results[f"analog_card.items@{size}"] = len(card.canvas.find_all())
+        top.destroy()
+
+    # ClockApp.update_all(): все карточки должны тикнуть / никто не должен
+    app_root = tk.Toplevel(root)
+    app = last.ClockApp(app_root)
+    app_root.update()
+
+    def all_due():
+        for key in app.next_due:
+            app.next_due[key] = 0.0
+        app.update_all()
+
+    results["update_all.due"] = timeit_ms(all_due, repeat)
+    results["update_all.idle"] = timeit_ms(app.update_all, repeat)
+    app_root.destroy()
+
+    def run(seconds):
+        root.after(int(seconds * 1000), root.quit)
+        root.mainloop()
+
+    results.update(bench_jitter(root, run, duration=duration))
+    root.destroy()
+    return results
+
+
+# ---------------------------------------------------------
+# Xvfb, сравнение с базой, запуск
+# ---------------------------------------------------------
+
+def start_xvfb():
+    """Поднимает виртуальный дисплей, если его нет. Возвращает процесс."""
+    if os.environ.get("DISPLAY"):
+        return None
+    xvfb = shutil.which("Xvfb")
+    if xvfb is None:
+        return None
+    display = ":99"
+    proc = subprocess.Popen(
+        [xvfb, display, "-screen", "0", "1920x1080x24", "-nolisten", "tcp"],
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    time.sleep(0.5)
+    os.environ["DISPLAY"] = display
+    return proc
+
+
+def compare(results, baseline, threshold, zero_tolerance=0.0):
+    """Список регрессий: (метрика, база, сейчас, % ухудшения).
+
+    Для нулевой базы (например, пропущенных кадров) процентов не
+    бывает: сравниваем разницу с zero_tolerance, % ухудшения — None.
+    """
+    regressions = []
+    for name, old in baseline.items():
+        new = results.get(name)
+        if new is None:
+            continue
+        if not old:
+            if new - old > zero_tolerance:
+                regressions.append((name, old, new, None))
+            continue
+        change = (new - old) / old * 100
+        if change > threshold:
+            regressions.append((name, old, new, change))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--mode", choices=("auto", "tk", "headless"),
+                        default="auto")
+    parser.add_argument("--xvfb", action="store_true",
+                        help="поднять Xvfb, если нет DISPLAY")
+    parser.add_argument("--sizes", type=int, nargs="+", default=SIZES)
+    parser.add_argument("--repeat", type=int, default=50)
+    parser.add_argument("--jitter-seconds", type=float, default=2.0)
+    parser.add_argument("-o", "--output", help="куда записать JSON")
+    parser.add_argument("--baseline", help="JSON с базовыми замерами")
+    parser.add_argument("--threshold", type=float, default=20.0,
+                        help="допустимое ухудшение, %%")
+    parser.add_argument("--zero-tolerance", type=float, default=0.0,
+                        help="допустимый рост метрик с нулевой базой "
+                             "(в их единицах)")
+    parser.add_argument("--save-baseline",
+                        help="сохранить текущие замеры как базу")
+    args = parser.parse_args(argv)
+
+    xvfb = start_xvfb() if args.xvfb else None
+    try:
+        mode = args.mode
+        if mode == "auto":
+            mode = "tk" if os.environ.get("DISPLAY") else "headless"
+        bench = bench_tk if mode == "tk" else bench_headless
+        results = bench(args.sizes, args.repeat, args.jitter_seconds)
+    finally:
+        if xvfb is not None:
+            xvfb.terminate()
+
+    report = {
+        "mode": mode,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "results": results,
+    }
+    text = json.dumps(report, indent=2, ensure_ascii=False)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+
+    if args.save_baseline:
+        with open(args.save_baseline, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+        if baseline.get("mode") != mode:
+            print(f"база снята в режиме {baseline.get('mode')}, "
+                  f"а сейчас {mode}", file=sys.stderr)
+            return 2
+        regressions = compare(results, baseline["results"], args.threshold,
+                              args.zero_tolerance)
+        for name, old, new, change in regressions:
+            delta = (f"+{new - old:g}" if change is None
+                     else f"+{change:.0f}%")
+            print(f"РЕГРЕССИЯ {name}: {old:.3f} -> {new:.3f} ({delta})",
+                  file=sys.stderr)
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
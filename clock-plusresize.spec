@@ -10,7 +10,9 @@ a = Analysis(
     hookspath=[],
     hooksconfig={},
     runtime_hooks=[],
-    excludes=[],
+    # NumPy — только необязательное ускорение geometry.py; без него exe
+    # в разы меньше
+    excludes=['numpy'],
     noarchive=False,
     optimize=0,
 )
@@ -1,7 +1,11 @@
 import tkinter as tk
-import math
 import datetime
 
+from frame import frame_batch
+from geometry import NUMERALS, TICKS, hand_point, hand_turns
+from scheduler import LOW_POWER, TickScheduler, WindowVisibility
+from themes import DEFAULT_THEME as THEME
+
 # Размер окна и параметры циферблата
 WIDTH = HEIGHT = 500
 CENTER = WIDTH // 2
@@ -10,29 +14,24 @@ RADIUS = 220
 root = tk.Tk()
 root.title("Analog Clock")
 root.resizable(False, False)
-root.configure(bg="#222222")
+root.configure(bg=THEME.window)
 
 canvas = tk.Canvas(
     root,
     width=WIDTH,
     height=HEIGHT,
-    bg="#222222",
+    bg=THEME.window,
     highlightthickness=0
 )
 canvas.pack()
 
 cx = cy = CENTER
 
-# Фон с лёгким градиентом
-edge_color = (220, 220, 220)
-center_color = (255, 255, 255)
+# Фон с лёгким градиентом: цвета для каждого радиуса готовит тема
+gradient = THEME.gradient(RADIUS)
 
 for i in range(RADIUS, 0, -1):
-    t = i / RADIUS  # 1 на краю, 0 в центре
-    r = int(edge_color[0] * t + center_color[0] * (1 - t))
-    g = int(edge_color[1] * t + center_color[1] * (1 - t))
-    b = int(edge_color[2] * t + center_color[2] * (1 - t))
-    color = f"#{r:02x}{g:02x}{b:02x}"
+    color = gradient[i]  # край — gradient[RADIUS], центр — gradient[0]
     canvas.create_oval(cx - i, cy - i, cx + i, cy + i,
                        outline=color, fill=color)
 
@@ -43,12 +42,11 @@ canvas.create_oval(
     cx + RADIUS,
     cy + RADIUS,
     width=4,
-    outline="#000000"
+    outline=THEME.ink
 )
 
 # Риски (минутные и часовые)
-for i in range(60):
-    angle = math.radians(i * 6)
+for i, (ux, uy) in enumerate(TICKS):
     if i % 5 == 0:  # каждые 5 минут – толстая риска
         inner = RADIUS - 25
         width_line = 4
@@ -56,23 +54,23 @@ for i in range(60):
         inner = RADIUS - 15
         width_line = 1
 
-    x1 = cx + inner * math.sin(angle)
-    y1 = cy - inner * math.cos(angle)
-    x2 = cx + RADIUS * math.sin(angle)
-    y2 = cy - RADIUS * math.cos(angle)
+    x1 = cx + inner * ux
+    y1 = cy + inner * uy
+    x2 = cx + RADIUS * ux
+    y2 = cy + RADIUS * uy
 
     canvas.create_line(x1, y1, x2, y2,
-                       fill="#000000", width=width_line)
+                       fill=THEME.ink, width=width_line)
 
 # Цифры 1–12
-for h in range(1, 13):
-    angle = math.radians(h * 30)
-    num_radius = RADIUS - 55
-    x = cx + num_radius * math.sin(angle)
-    y = cy - num_radius * math.cos(angle)
+num_radius = RADIUS - 55
+for h, (ux, uy) in enumerate(NUMERALS, start=1):
+    x = cx + num_radius * ux
+    y = cy + num_radius * uy
     canvas.create_text(
         x, y,
         text=str(h),
+        fill=THEME.ink,
         font=("Arial", 26, "bold")
     )
 
@@ -80,58 +78,56 @@ for h in range(1, 13):
 hour_hand = canvas.create_line(
     cx, cy, cx, cy - RADIUS * 0.5,
     width=8,
-    fill="#000000",
+    fill=THEME.hand,
     capstyle=tk.ROUND
 )
 min_hand = canvas.create_line(
     cx, cy, cx, cy - RADIUS * 0.75,
     width=4,
-    fill="#000000",
+    fill=THEME.hand,
     capstyle=tk.ROUND
 )
 sec_hand = canvas.create_line(
     cx, cy, cx, cy - RADIUS * 0.85,
     width=2,
-    fill="#ff0000",
+    fill=THEME.second_hand,
     capstyle=tk.ROUND
 )
 
 # Красная точка в центре
 canvas.create_oval(
     cx - 8, cy - 8, cx + 8, cy + 8,
-    fill="#ff0000",
-    outline="#000000",
+    fill=THEME.second_hand,
+    outline=THEME.ink,
     width=2
 )
 
+batch = frame_batch(canvas)
 
-def update_clock():
-    now = datetime.datetime.now()
-
-    second = now.second + now.microsecond / 1_000_000
-    minute = now.minute + second / 60.0
-    hour = (now.hour % 12) + minute / 60.0
-
-    angle_sec = math.radians(second * 6)   # 360 / 60
-    angle_min = math.radians(minute * 6)
-    angle_hour = math.radians(hour * 30)   # 360 / 12
-
-    def get_xy(angle, length):
-        x = cx + length * math.sin(angle)
-        y = cy - length * math.cos(angle)
-        return x, y
-
-    xh, yh = get_xy(angle_hour, RADIUS * 0.5)
-    xm, ym = get_xy(angle_min, RADIUS * 0.75)
-    xs, ys = get_xy(angle_sec, RADIUS * 0.85)
 
-    canvas.coords(hour_hand, cx, cy, xh, yh)
-    canvas.coords(min_hand, cx, cy, xm, ym)
-    canvas.coords(sec_hand, cx, cy, xs, ys)
-
-    # Обновляем примерно 25 раз в секунду (плавная секундная стрелка)
-    root.after(40, update_clock)
-
-
-update_clock()
+def update_clock():
+    # Доли оборота -> готовые единичные векторы из таблицы
+    hour, minute, second = hand_turns(datetime.datetime.now(),
+                                      sweep=not LOW_POWER)
+    xh, yh = hand_point(hour, cx, cy, RADIUS * 0.5)
+    xm, ym = hand_point(minute, cx, cy, RADIUS * 0.75)
+    xs, ys = hand_point(second, cx, cy, RADIUS * 0.85)
+
+    # Три стрелки — один переход в Tcl вместо трёх
+    with batch:
+        batch.coords(canvas, hour_hand, cx, cy, xh, yh)
+        batch.coords(canvas, min_hand, cx, cy, xm, ym)
+        batch.coords(canvas, sec_hand, cx, cy, xs, ys)
+
+
+# 25 раз в секунду (плавная секундная стрелка), в режиме экономии — раз
+# в секунду; кадры привязаны к секундам
+ticker = TickScheduler(root, update_clock,
+                       period_ms=1000 if LOW_POWER else 40, align=True)
+ticker.start()
+
+# Свёрнутому или закрытому окну обновлять нечего — тики останавливаем
+visibility = WindowVisibility(
+    root, lambda hidden: ticker.stop() if hidden else ticker.start()
+)
 root.mainloop()
\ No newline at end of file
@@ -0,0 +1,451 @@
+"""Управление часами извне: JSON-RPC 2.0 через локальный сокет.
+
+Запросы — по одному JSON в строке (можно и массивом-пакетом), ответы —
+тоже строками, с тем же ``id``. Клиент может слать запросы не дожидаясь
+ответов (конвейер), клиентов может быть сколько угодно: сокеты
+обслуживает asyncio в отдельном потоке.
+
+С Tk можно работать только из главного потока, поэтому сами команды
+выполняются там. Поток asyncio складывает запросы в очередь и будит
+цикл Tk байтом в socketpair, который Tk слушает как обычный файл
+(``createfilehandler``): никакого опроса по ``after``, команда
+выполняется при первой же возможности. Всё, что накопилось к этому
+моменту (от всех клиентов), выполняется за одно пробуждение и одним
+пакетом Tcl-команд кадра.
+
+Unix-сокет доступен только владельцу (права 0600). На localhost по TCP
+подключиться может любой процесс машины, поэтому там первая строка
+клиента — приветствие ``hello`` с токеном этого запуска; токен лежит
+в файле с правами 0600 рядом с временными файлами пользователя. Первая
+строка, которая не JSON-RPC (например, HTTP-запрос от браузера), сразу
+закрывает соединение.
+
+    python control.py timers.add '{"name": "чай", "seconds": 180}'
+"""
+
+import argparse
+import asyncio
+import hmac
+import json
+import os
+import re
+import secrets
+import socket
+import sys
+import tempfile
+import threading
+
+import tkinter as tk
+
+from frame import frame_batch
+
+# Коды ошибок JSON-RPC 2.0
+PARSE_ERROR = -32700
+INVALID_REQUEST = -32600
+METHOD_NOT_FOUND = -32601
+INVALID_PARAMS = -32602
+INTERNAL_ERROR = -32603
+UNAUTHORIZED = -32001  # из диапазона ошибок, определяемых сервером
+
+# Первая строка по TCP: {"method": "hello", "params": {"token": ...}}
+HELLO = "hello"
+
+# «GET / HTTP/1.1» и т. п.: браузер или сканер, а не наш клиент
+_HTTP_REQUEST = re.compile(rb"^[A-Z]+ \S+ HTTP/\d")
+
+# Выше этого объёма неотправленных ответов клиент притормаживается
+WRITE_LIMIT = 1 << 20
+
+
+class ControlError(Exception):
+    def __init__(self, code, message):
+        super().__init__(message)
+        self.code = code
+        self.message = message
+
+
+def default_address():
+    """CLOCK_CONTROL или сокет во временном каталоге (localhost на Windows)."""
+    address = os.environ.get("CLOCK_CONTROL")
+    if address:
+        return address
+    if not hasattr(socket, "AF_UNIX"):
+        return "127.0.0.1:8765"
+    return os.path.join(tempfile.gettempdir(),
+                        f"clock-suite-{os.getuid()}.sock")
+
+
+def parse_address(address):
+    """«host:port» -> ("tcp", host, port), иначе путь Unix-сокета."""
+    host, sep, port = address.rpartition(":")
+    if sep and port.isdigit() and os.sep not in address:
+        return "tcp", host or "127.0.0.1", int(port)
+    return "unix", address, None
+
+
+def token_path(address):
+    """Файл токена для TCP-адреса (у Unix-сокета токена нет)."""
+    kind, host, port = parse_address(address)
+    if kind != "tcp":
+        return None
+    return os.path.join(tempfile.gettempdir(),
+                        f"clock-suite-{port}.token")
+
+
+def _write_token(path, token):
+    """Токен — в файл, который может прочитать только владелец."""
+    try:
+        os.unlink(path)  # чужой файл с широкими правами не переиспользуем
+    except FileNotFoundError:
+        pass
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+    with os.fdopen(fd, "w", encoding="ascii") as f:
+        f.write(token)
+
+
+def _first_message(line):
+    """Разобранная первая строка клиента или None, если это не JSON-RPC."""
+    if _HTTP_REQUEST.match(line):
+        return None
+    try:
+        message = json.loads(line)
+    except ValueError:
+        return None
+    items = message if isinstance(message, list) else [message]
+    if not items or not all(isinstance(item, dict)
+                            and item.get("jsonrpc") == "2.0"
+                            for item in items):
+        return None
+    return message
+
+
+def _error(request_id, code, message):
+    return {"jsonrpc": "2.0", "id": request_id,
+            "error": {"code": code, "message": message}}
+
+
+class ControlServer:
+    """Сервер в фоновом потоке; команды выполняет ``dispatch(метод,
+    параметры)`` в потоке Tk и возвращает результат (или бросает
+    ControlError)."""
+
+    def __init__(self, root, dispatch, address=None, on_batch=None):
+        self.root = root
+        self.dispatch = dispatch
+        # Вызывается после каждой пачки команд (например, разбудить цикл)
+        self.on_batch = on_batch
+        self.address = address or default_address()
+        self.kind, self.host, self.port = parse_address(self.address)
+        self.batch = frame_batch(root)
+        # Токен запуска: нужен только для TCP, см. _greet
+        self.token = None
+        self.token_path = token_path(self.address)
+
+        self._inbox = []
+        self._lock = threading.Lock()
+        self._signalled = False
+        self._loop = None
+        self._server = None
+        self._thread = None
+        self._ready = threading.Event()
+        self._failure = None
+        self._wake_r = self._wake_w = None
+        # Сколько выполнено команд и сколько раз ради них будили Tk
+        self.commands = 0
+        self.wakeups = 0
+
+    # ---------- запуск и остановка (поток Tk) ----------
+
+    def start(self):
+        if self.token_path is not None:
+            self.token = secrets.token_urlsafe(32)
+            _write_token(self.token_path, self.token)
+        if hasattr(self.root.tk, "createfilehandler"):
+            self._wake_r, self._wake_w = socket.socketpair()
+            self._wake_r.setblocking(False)
+            self._wake_w.setblocking(False)
+            self.root.tk.createfilehandler(self._wake_r, tk.READABLE,
+                                           self._on_wake)
+        else:
+            # Windows: файловых обработчиков у Tk нет, зато tkinter сам
+            # передаёт вызов из чужого потока в поток интерпретатора
+            self.root.bind("<<ControlWake>>", self._on_wake)
+
+        self._thread = threading.Thread(
+            target=self._run, name="control-api", daemon=True
+        )
+        self._thread.start()
+        self._ready.wait()
+        if self._failure is not None:
+            self._close_wakeup()
+            self._remove_token()
+            raise self._failure
+        return self
+
+    def stop(self):
+        if self._loop is not None and self._server is not None:
+            self._loop.call_soon_threadsafe(self._server.close)
+        self._close_wakeup()
+        self._remove_token()
+        if self.kind == "unix":
+            try:
+                os.unlink(self.host)
+            except OSError:
+                pass
+
+    def _remove_token(self):
+        if self.token is not None:
+            try:
+                os.unlink(self.token_path)
+            except OSError:
+                pass
+            self.token = None
+
+    def _close_wakeup(self):
+        if self._wake_r is not None:
+            self.root.tk.deletefilehandler(self._wake_r)
+            self._wake_r.close()
+            self._wake_w.close()
+            self._wake_r = self._wake_w = None
+
+    # ---------- поток asyncio ----------
+
+    def _run(self):
+        try:
+            asyncio.run(self._serve())
+        except Exception as exc:
+            self._failure = exc
+            self._ready.set()
+
+    async def _serve(self):
+        self._loop = asyncio.get_running_loop()
+        if self.kind == "unix":
+            _remove_stale_socket(self.host)
+            self._server = await asyncio.start_unix_server(
+                self._client, path=self.host
+            )
+            os.chmod(self.host, 0o600)
+        else:
+            self._server = await asyncio.start_server(
+                self._client, host=self.host, port=self.port
+            )
+        self._ready.set()
+        async with self._server:
+            try:
+                await self._server.serve_forever()
+            except asyncio.CancelledError:
+                pass
+
+    async def _client(self, reader, writer):
+        pending = set()
+        greeted = False
+        try:
+            while True:
+                try:
+                    line = await reader.readline()
+                except (ConnectionError, ValueError):
+                    break
+                if not line:
+                    break
+                if not line.strip():
+                    continue
+                if not greeted:
+                    if not await self._greet(line, writer):
+                        break
+                    greeted = True
+                    if self.token is not None:
+                        continue  # приветствие — не команда
+                # Не ждём ответа: следующий запрос читается сразу
+                task = asyncio.create_task(self._answer(line, writer))
+                pending.add(task)
+                task.add_done_callback(pending.discard)
+            if pending:
+                await asyncio.wait(pending)
+        finally:
+            writer.close()
+
+    async def _greet(self, line, writer):
+        """Проверить первую строку клиента; False — закрыть соединение."""
+        message = _first_message(line)
+        if message is None:
+            return False
+        if self.token is None:
+            return True
+        if not isinstance(message, dict):
+            message = {}  # пакет вместо приветствия
+        request_id = message.get("id")
+        params = message.get("params")
+        token = params.get("token") if isinstance(params, dict) else None
+        ok = (message.get("method") == HELLO and isinstance(token, str)
+              and hmac.compare_digest(token.encode(), self.token.encode()))
+        if ok:
+            reply = {"jsonrpc": "2.0", "id": request_id, "result": True}
+        else:
+            reply = _error(request_id, UNAUTHORIZED, "Unauthorized")
+        writer.write(json.dumps(reply).encode() + b"\n")
+        await writer.drain()
+        return ok
+
+    async def _answer(self, line, writer):
+        try:
+            message = json.loads(line)
+        except ValueError:
+            reply = _error(None, PARSE_ERROR, "Parse error")
+        else:
+            if isinstance(message, list) and message:
+                replies = await asyncio.gather(
+                    *(self._call(item) for item in message)
+                )
+                reply = [r for r in replies if r is not None] or None
+            else:
+                reply = await self._call(message)
+        if reply is None or writer.is_closing():
+            return
+        writer.write(json.dumps(reply, ensure_ascii=False).encode() + b"\n")
+        if writer.transport.get_write_buffer_size() > WRITE_LIMIT:
+            await writer.drain()
+
+    async def _call(self, message):
+        if (not isinstance(message, dict)
+                or not isinstance(message.get("method"), str)):
+            return _error(None, INVALID_REQUEST, "Invalid Request")
+        request_id = message.get("id")
+        params = message.get("params", {})
+        if not isinstance(params, (dict, list)):
+            return _error(request_id, INVALID_PARAMS, "Invalid params")
+
+        future = self._loop.create_future()
+        self._submit(message["method"], params, future)
+        ok, value = await future
+        if "id" not in message:
+            return None  # уведомление: ответа не ждут
+        if ok:
+            return {"jsonrpc": "2.0", "id": request_id, "result": value}
+        code, text = value
+        return _error(request_id, code, text)
+
+    def _submit(self, method, params, future):
+        with self._lock:
+            self._inbox.append((method, params, future))
+            if self._signalled:
+                return  # Tk уже разбужен и заберёт и этот запрос
+            self._signalled = True
+        if self._wake_w is not None:
+            try:
+                self._wake_w.send(b"\0")
+            except BlockingIOError:
+                pass  # в сокете уже лежит непрочитанный байт
+        else:
+            self.root.event_generate("<<ControlWake>>", when="tail")
+
+    # ---------- поток Tk ----------
+
+    def _on_wake(self, *args):
+        if self._wake_r is not None:
+            try:
+                self._wake_r.recv(4096)
+            except BlockingIOError:
+                pass
+        with self._lock:
+            inbox, self._inbox = self._inbox, []
+            self._signalled = False
+        if not inbox:
+            return
+
+        results = []
+        with self.batch:
+            for method, params, future in inbox:
+                results.append((future, self._execute(method, params)))
+        self.commands += len(inbox)
+        self.wakeups += 1
+        if self.on_batch is not None:
+            self.on_batch()
+        self._loop.call_soon_threadsafe(_resolve, results)
+
+    def _execute(self, method, params):
+        try:
+            return True, self.dispatch(method, params)
+        except ControlError as exc:
+            return False, (exc.code, exc.message)
+        except Exception as exc:
+            return False, (INTERNAL_ERROR, f"{type(exc).__name__}: {exc}")
+
+
+def _resolve(results):
+    for future, outcome in results:
+        if not future.done():
+            future.set_result(outcome)
+
+
+def _remove_stale_socket(path):
+    """Файл сокета от упавшего процесса мешает bind — убираем, если никто
+    не слушает; если слушает — пусть bind честно упадёт."""
+    if not os.path.exists(path):
+        return
+    probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        probe.connect(path)
+    except OSError:
+        os.unlink(path)
+    finally:
+        probe.close()
+
+
+# ---------------------------------------------------------
+# Клиент командной строки
+# ---------------------------------------------------------
+
+def connect(address=None):
+    """Соединение с часами; по TCP — уже с пройденным приветствием."""
+    address = address or default_address()
+    kind, host, port = parse_address(address)
+    if kind == "unix":
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.connect(host)
+        return sock
+    with open(token_path(address), encoding="ascii") as f:
+        token = f.read().strip()
+    sock = socket.create_connection((host, port))
+    sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+    hello = {"jsonrpc": "2.0", "id": 0, "method": HELLO,
+             "params": {"token": token}}
+    sock.sendall(json.dumps(hello).encode() + b"\n")
+    # До ответа на приветствие сервер больше ничего не шлёт, так что
+    # буфер makefile не унесёт чужих байтов
+    with sock.makefile("rb") as f:
+        reply = json.loads(f.readline() or b"null")
+    if not isinstance(reply, dict) or "error" in reply:
+        sock.close()
+        raise ControlError(UNAUTHORIZED, "Unauthorized")
+    return sock
+
+
+def call(method, params=None, address=None):
+    """Один синхронный вызов; возвращает result или бросает ControlError."""
+    with connect(address) as sock:
+        request = {"jsonrpc": "2.0", "id": 1, "method": method,
+                   "params": params or {}}
+        sock.sendall(json.dumps(request, ensure_ascii=False).encode() + b"\n")
+        reply = json.loads(sock.makefile("rb").readline())
+    if "error" in reply:
+        raise ControlError(reply["error"]["code"], reply["error"]["message"])
+    return reply["result"]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Команда запущенным часам (JSON-RPC)"
+    )
+    parser.add_argument("method", help="например, timers.add или cards.show")
+    parser.add_argument("params", nargs="?", default="{}",
+                        help="параметры в JSON")
+    parser.add_argument("--address", default=None,
+                        help="путь сокета или host:port (или CLOCK_CONTROL)")
+    args = parser.parse_args()
+
+    try:
+        result = call(args.method, json.loads(args.params), args.address)
+    except ControlError as exc:
+        print(f"ошибка {exc.code}: {exc.message}", file=sys.stderr)
+        sys.exit(1)
+    print(json.dumps(result, ensure_ascii=False, indent=2))
@@ -0,0 +1,308 @@
+"""Неподвижный слой циферблата (градиент, граница, риски, цифры) одной
+картинкой вместо сотен элементов холста.
+
+Картинку нового размера рисует фоновый поток (``request_dial``): на
+больших циферблатах это сотни миллисекунд чистого Python, и в потоке
+Tk они останавливали бы часы. Пока новая не готова, на холсте остаётся
+прежняя.
+"""
+
+import math
+import queue
+from collections import OrderedDict
+from functools import lru_cache
+
+import tkinter as tk
+
+import geometry
+from diskcache import DiskCache, default_cache_dir
+from geometry import np
+from raster import Raster
+from sprites import SpriteWorker
+
+# Цвета по умолчанию (как в исходных скриптах)
+EDGE_COLOR = (220, 220, 220)
+CENTER_COLOR = (255, 255, 255)
+BG_COLOR = (0x22, 0x22, 0x22)
+
+# Меняется при любой правке dial_ppm: старые картинки на диске
+# перестают совпадать по ключу и со временем вытесняются
+RENDERER_VERSION = 1
+
+# Запас вокруг круга, чтобы внешняя граница не обрезалась краем картинки
+DIAL_PAD = 3
+
+# Как часто поток Tk забирает готовые картинки (только пока их ждёт)
+POLL_MS = 15
+
+
+@lru_cache(maxsize=32)
+def gradient_palette(radius, edge_color, center_color):
+    """Цвет для каждого целого расстояния от центра 0..radius.
+
+    Результат кэшируется (цвета — кортежи), поэтому не изменять."""
+    palette = []
+    for i in range(radius + 1):
+        t = i / radius if radius else 0.0
+        r = int(edge_color[0] * t + center_color[0] * (1 - t))
+        g = int(edge_color[1] * t + center_color[1] * (1 - t))
+        b = int(edge_color[2] * t + center_color[2] * (1 - t))
+        palette.append(bytes((r, g, b)))
+    return palette
+
+
+def gradient_ppm(radius, edge_color=EDGE_COLOR, center_color=CENTER_COLOR,
+                 bg_color=BG_COLOR, pad=0):
+    """Квадрат 2*(radius+pad) с радиальным градиентом в формате PPM (P6).
+
+    Углы вне круга заливаются цветом фона холста, поэтому картинка
+    не отличается от старого рисунка из концентрических овалов.
+    """
+    radius = int(radius)
+    half_size = radius + pad
+    size = 2 * half_size
+    palette = gradient_palette(radius, edge_color, center_color)
+    bg = bytes(bg_color)
+    header = f"P6\n{size} {size}\n255\n".encode("ascii")
+
+    if np is not None:
+        # Векторный путь: расстояние до центра для всей картинки сразу
+        axis = np.arange(size) + 0.5 - half_size
+        d = np.ceil(np.hypot(axis[None, :], axis[:, None])).astype(np.intp)
+        d[d > radius] = radius + 1
+        table = np.frombuffer(b"".join(palette) + bg, dtype=np.uint8)
+        return header + table.reshape(-1, 3)[d].tobytes()
+
+    # Строки симметричны по вертикали, а каждая строка — по горизонтали,
+    # поэтому считаем только правую половину верхней половины.
+    rows = []
+    for y in range(half_size):
+        dy = half_size - y - 0.5
+        half = []
+        for x in range(half_size):
+            dx = x + 0.5
+            d = math.ceil(math.hypot(dx, dy))
+            half.append(palette[d] if d <= radius else bg)
+        right = b"".join(half)
+        left = b"".join(reversed(half))
+        rows.append(left + right)
+
+    body = b"".join(rows) + b"".join(reversed(rows))
+    return header + body
+
+
+def dial_ppm(radius, font_px, edge_color=EDGE_COLOR,
+             center_color=CENTER_COLOR, bg_color=BG_COLOR,
+             ink_color=(0, 0, 0)):
+    """Весь неподвижный слой циферблата одной картинкой: градиент,
+    внешняя граница, риски и цифры. Центр — в середине картинки."""
+    canvas = Raster.from_ppm(gradient_ppm(
+        radius, edge_color, center_color, bg_color, DIAL_PAD
+    ))
+
+    c = canvas.width / 2
+    canvas.ring(c, c, radius, 4, ink_color)
+    for (x1, y1, x2, y2), inner in zip(
+        geometry.tick_segments(c, c, radius), geometry.TICK_INNER
+    ):
+        canvas.line(x1, y1, x2, y2, 4 if inner < 0.9 else 1, ink_color)
+    # font_px=0 — без цифр (для совсем маленьких циферблатов)
+    if font_px > 0:
+        for h_, (x, y) in enumerate(
+            geometry.numeral_points(c, c, radius * 0.75), start=1
+        ):
+            canvas.text(x, y, str(h_), font_px, ink_color)
+    return canvas.ppm()
+
+
+def valid_ppm(data):
+    """Заголовок P6 есть и длина совпадает с размером картинки."""
+    try:
+        magic, w, h, maxval = data[:64].split(None, 4)[:4]
+        w, h = int(w), int(h)
+    except ValueError:
+        return False
+    if magic != b"P6" or maxval != b"255":
+        return False
+    # Заголовок заканчивается переводом строки прямо перед пикселями
+    header_len = len(data) - 3 * w * h
+    return header_len > 0 and data[header_len - 1:header_len] == b"\n"
+
+
+class DialRequest:
+    """Заявка на картинку, которая рисуется в фоне."""
+
+    def __init__(self, cache, key, on_ready):
+        self.cache = cache
+        self.key = key
+        self.on_ready = on_ready
+
+    def cancel(self):
+        """Картинка больше не нужна (новый размер, закрытое окно)."""
+        self.cache._cancel(self)
+
+
+class _RenderJob:
+    """Задание для SpriteWorker: PPM по ключу, на диск и в очередь."""
+
+    def __init__(self, key, render, disk, done):
+        self.key = key
+        self.render = render
+        self.disk = disk
+        self.done = done
+        self.cancelled = False
+
+    def build(self):
+        try:
+            data = self.render(*self.key)
+            if self.disk is not None:
+                self.disk.put(self.key, data)
+        except Exception as exc:
+            # Исключение — в поток Tk, иначе умрёт сам фоновый поток
+            data = exc
+        self.done.put((self.key, data))
+
+
+class ImageCache:
+    """LRU-кэш готовых картинок Tk: ключ — параметры отрисовки.
+
+    С disk при промахе в памяти сначала смотрим на диск и только потом
+    рисуем; нарисованное сохраняется туда же для следующего запуска.
+    С worker промахи можно рисовать в фоне (см. ``request``).
+    """
+
+    def __init__(self, maxsize=8, disk=None, worker=None):
+        self.maxsize = maxsize
+        self.disk = disk
+        self.worker = worker
+        self._images = OrderedDict()
+        # {ключ: (задание, [заявки])} — рисуется в фоне
+        self._pending = {}
+        # Готовое из фона: (ключ, PPM или исключение)
+        self._done = queue.Queue()
+        # Корневое окно, через after которого забираются готовые картинки
+        self._poller = None
+
+    def _cached(self, master, key):
+        """Картинка из памяти или с диска; None — придётся рисовать."""
+        image = self._images.get(key)
+        if image is not None:
+            self._images.move_to_end(key)
+            return image
+
+        data = self.disk.get(key) if self.disk is not None else None
+        if data is None or not valid_ppm(data):
+            return None
+        return self._store(master, key, data)
+
+    def _store(self, master, key, data):
+        image = tk.PhotoImage(master=master, data=data, format="PPM")
+        self._images[key] = image
+        while len(self._images) > self.maxsize:
+            self._images.popitem(last=False)
+        return image
+
+    def get(self, master, key, render):
+        """Картинка по ключу; при промахе — render(*key) -> PPM."""
+        image = self._cached(master, key)
+        if image is not None:
+            return image
+
+        data = render(*key)
+        if self.disk is not None:
+            self.disk.put(key, data)
+        return self._store(master, key, data)
+
+    def request(self, master, key, render, on_ready):
+        """Как get, но промах рисуется в фоне: (картинка, None) или
+        (None, заявка); on_ready(картинка) вызывается потом в потоке Tk.
+
+        Одинаковые заявки рисуются один раз."""
+        image = self._cached(master, key)
+        if image is not None or self.worker is None:
+            return image or self.get(master, key, render), None
+
+        request = DialRequest(self, key, on_ready)
+        entry = self._pending.get(key)
+        if entry is None:
+            job = _RenderJob(key, render, self.disk, self._done)
+            entry = self._pending[key] = (job, [])
+            self.worker.submit(job)
+        entry[1].append(request)
+        if self._poller is None:
+            self._poller = master.nametowidget(".")
+            self._poller.after(POLL_MS, self._poll)
+        return None, request
+
+    def _cancel(self, request):
+        entry = self._pending.get(request.key)
+        if entry is None or request not in entry[1]:
+            return
+        entry[1].remove(request)
+        if not entry[1]:
+            # Не начатое задание фоновый поток пропустит
+            entry[0].cancelled = True
+            del self._pending[request.key]
+
+    def _poll(self):
+        failure = None
+        while True:
+            try:
+                key, data = self._done.get_nowait()
+            except queue.Empty:
+                break
+            failure = self._deliver(key, data) or failure
+        if self._pending:
+            self._poller.after(POLL_MS, self._poll)
+        else:
+            self._poller = None
+        if failure is not None:
+            raise failure
+
+    def _deliver(self, key, data):
+        """Раздать готовую картинку; возвращает исключение рисования."""
+        entry = self._pending.pop(key, None)
+        if isinstance(data, Exception):
+            return data
+        image = self._store(self._poller, key, data)
+        if entry is not None:
+            entry[0].cancelled = True
+            for request in entry[1]:
+                request.on_ready(image)
+        return None
+
+    def finish(self):
+        """Дождаться всего, что рисуется в фоне, и раздать (для замеров)."""
+        while self._pending:
+            key, data = self._done.get()
+            failure = self._deliver(key, data)
+            if failure is not None:
+                raise failure
+
+    def clear(self, disk=False):
+        self._images.clear()
+        if disk and self.disk is not None:
+            self.disk.clear()
+
+
+# Общий кэш для всех циферблатов процесса (и между запусками — на диске)
+dial_cache = ImageCache(disk=DiskCache(
+    default_cache_dir(), namespace=f"dial-v{RENDERER_VERSION}"
+), worker=SpriteWorker(name="dial-render"))
+
+
+def dial_image(master, radius, font_px, colors=None):
+    """colors — (край, центр, фон, чернила), обычно ``Theme.dial_colors``."""
+    key = (int(radius), int(font_px))
+    if colors is not None:
+        key += tuple(colors)
+    return dial_cache.get(master, key, dial_ppm)
+
+
+def request_dial(master, radius, font_px, colors, on_ready):
+    """Как dial_image, но без рисования в потоке Tk: (картинка, None)
+    или (None, заявка), и тогда on_ready(картинка) — когда будет готова."""
+    key = (int(radius), int(font_px))
+    if colors is not None:
+        key += tuple(colors)
+    return dial_cache.request(master, key, dial_ppm, on_ready)
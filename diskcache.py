@@ -0,0 +1,121 @@
+"""Кэш готовых картинок на диске — чтобы холодный старт не рисовал заново.
+
+Каждая запись — отдельный файл, имя которого — хэш ключа. Чтение идёт
+через ``mmap`` (без промежуточных буферов чтения), запись — во
+временный файл рядом и ``os.replace``: несколько окон, стартующих
+одновременно, могут писать одну и ту же запись, читатель всегда видит
+либо старый файл целиком, либо новый. Размер каталога ограничен,
+лишнее удаляется по давности использования (mtime обновляется при
+каждом попадании).
+
+Кэш — только ускорение: любые ошибки файловой системы считаются
+промахом, и картинка просто рисуется заново.
+"""
+
+import hashlib
+import mmap
+import os
+import sys
+import tempfile
+
+SUFFIX = ".bin"
+
+
+def default_cache_dir(app="analog-clock"):
+    """Каталог кэша пользователя: CLOCK_CACHE_DIR, иначе системный."""
+    path = os.environ.get("CLOCK_CACHE_DIR")
+    if path:
+        return path
+    if sys.platform == "win32":
+        base = os.environ.get("LOCALAPPDATA") or os.path.expanduser("~")
+    else:
+        base = (os.environ.get("XDG_CACHE_HOME") or
+                os.path.expanduser("~/.cache"))
+    return os.path.join(base, app)
+
+
+class DiskCache:
+    def __init__(self, directory, namespace="", max_bytes=64 * 1024 * 1024):
+        self.directory = directory
+        self.namespace = namespace
+        self.max_bytes = max_bytes
+
+    def path(self, key):
+        digest = hashlib.sha1(repr(key).encode("utf-8")).hexdigest()[:20]
+        name = f"{self.namespace}-{digest}" if self.namespace else digest
+        return os.path.join(self.directory, name + SUFFIX)
+
+    def get(self, key):
+        """Байты записи или None при промахе."""
+        path = self.path(key)
+        try:
+            with open(path, "rb") as f:
+                size = os.fstat(f.fileno()).st_size
+                if not size:
+                    return None
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    data = mm[:]
+            # Отметка для LRU: недавно нужные записи вытесняются последними
+            os.utime(path)
+        except (OSError, ValueError):
+            return None
+        return data
+
+    def put(self, key, data):
+        path = self.path(key)
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+            try:
+                with os.fdopen(fd, "wb") as f:
+                    f.write(data)
+                os.replace(tmp, path)
+            except BaseException:
+                try:
+                    os.unlink(tmp)
+                except OSError:
+                    pass
+                raise
+        except OSError:
+            return
+        self.evict()
+
+    def evict(self):
+        """Удаляет самые давние записи, пока каталог больше max_bytes."""
+        entries = []
+        total = 0
+        try:
+            with os.scandir(self.directory) as it:
+                for entry in it:
+                    if not entry.name.endswith(SUFFIX):
+                        continue
+                    try:
+                        st = entry.stat()
+                    except OSError:
+                        continue
+                    entries.append((st.st_mtime, st.st_size, entry.path))
+                    total += st.st_size
+        except OSError:
+            return
+
+        entries.sort()
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            try:
+                os.unlink(path)
+            except OSError:
+                pass  # уже удалил другой процесс
+            total -= size
+
+    def clear(self):
+        try:
+            with os.scandir(self.directory) as it:
+                for entry in it:
+                    if entry.name.endswith(SUFFIX):
+                        try:
+                            os.unlink(entry.path)
+                        except OSError:
+                            pass
+        except OSError:
+            pass
@@ -0,0 +1,310 @@
+"""Циферблат в «удерживаемом» режиме: элементы холста создаются один раз.
+
+При изменении размера элементы не удаляются, а только двигаются через
+``coords``/``itemconfig``. Пересоздание нужно лишь при смене структуры.
+
+Слоёв два: неподвижный (градиент, граница, риски, цифры) — одна
+кэшированная картинка, и подвижный — стрелки с точкой в центре. Tk
+перерисовывает только рамки тех стрелок, которые реально сдвинулись.
+Картинку нового размера рисует фоновый поток, до тех пор на месте
+остаётся старая.
+
+С ``antialias=True`` стрелки — сглаженные спрайты из атласа (см.
+sprites.py), а линии Tk остаются запасным вариантом, пока атлас
+рисуется, и на время быстрого масштабирования.
+"""
+
+import tkinter as tk
+
+import geometry
+from dial import request_dial
+from frame import frame_batch
+from sprites import SPRITE_STEPS, atlas_key, atlas_pool
+from themes import DEFAULT_THEME
+
+TAG = "face"
+
+# Пропорции циферблата: карточка в last.py и отдельное окно
+# clock-plusresize.py (там поле шире, а стрелки толще)
+CARD_STYLE = dict(
+    margin=10, min_font=8,
+    hand_divisors=(62.5, 125, 250), hand_min=(3, 2, 1), dot_min=4
+)
+WINDOW_STYLE = dict(
+    margin=20, min_font=10,
+    hand_divisors=(40, 80, 120), hand_min=(4, 3, 2), dot_min=5
+)
+
+# Длины стрелок в долях радиуса: часовая, минутная, секундная
+HAND_LENGTHS = (0.5, 0.75, 0.85)
+
+
+class ClockFace:
+    def __init__(self, canvas, margin=10, min_font=8,
+                 hand_divisors=(62.5, 125, 250), hand_min=(3, 2, 1),
+                 dot_min=4, theme=DEFAULT_THEME, antialias=False):
+        self.canvas = canvas
+        # Сдвиги стрелок на кадре уходят в Tcl вместе с остальным кадром
+        self.batch = frame_batch(canvas)
+        self.theme = theme
+        self.antialias = antialias
+        self.margin = margin
+        self.min_font = min_font
+        self.hand_divisors = hand_divisors
+        self.hand_min = hand_min
+        self.dot_min = dot_min
+
+        self.width = self.height = 0
+        # Размер, под который сделана полная раскладка (None — нет такой)
+        self.laid_out = None
+        self.cx = self.cy = 0
+        self.radius = 0
+        self.size = 0
+
+        self.built = False
+        self.background = None
+        self.hour_hand = None
+        self.min_hand = None
+        self.sec_hand = None
+        self.dot = None
+        # Картинки-спрайты стрелок и их атласы (при antialias)
+        self.sprites = [None, None, None]
+        self._atlases = [None, None, None]
+        # Картинка фона на холсте. Кэш общий и может её вытеснить, а Tk
+        # удаляет картинку вместе с последней ссылкой Python — держим свою
+        self._dial_image = None
+        # Заявка на картинку фона, которая ещё рисуется в фоне
+        self._dial_request = None
+        # Какие стрелки сейчас показаны спрайтом, а не линией
+        self._sprite_shown = [False, False, False]
+
+        # Последние положения стрелок (доли оборота) — вернуть после раскладки
+        self.angles = (0.0, 0.0, 0.0)
+        # Уже выставленное на холсте: (индекс в таблице стрелок, спрайт)
+        self._placed = [None, None, None]
+
+    # ---------- создание элементов ----------
+
+    def build(self):
+        """Создаёт все элементы (в порядке отрисовки снизу вверх)."""
+        c = self.canvas
+        theme = self.theme
+        self.background = c.create_image(0, 0, tags=TAG)
+        self.hour_hand = c.create_line(
+            0, 0, 0, 0, fill=theme.hand, capstyle=tk.ROUND, tags=TAG
+        )
+        self.min_hand = c.create_line(
+            0, 0, 0, 0, fill=theme.hand, capstyle=tk.ROUND, tags=TAG
+        )
+        self.sec_hand = c.create_line(
+            0, 0, 0, 0, fill=theme.second_hand, capstyle=tk.ROUND, tags=TAG
+        )
+        self._sprite_shown = [False, False, False]
+        if self.antialias:
+            self.sprites = [
+                c.create_image(0, 0, anchor="nw", state="hidden", tags=TAG)
+                for _ in range(3)
+            ]
+        self.dot = c.create_oval(
+            0, 0, 0, 0, fill=theme.second_hand, outline=theme.ink, width=2,
+            tags=TAG
+        )
+        self.built = True
+
+    def set_theme(self, theme):
+        """Перекрашивает готовые элементы, не пересоздавая их."""
+        if theme is self.theme:
+            return
+        self.theme = theme
+        if not self.built:
+            return
+
+        c = self.canvas
+        c.itemconfig(self.hour_hand, fill=theme.hand)
+        c.itemconfig(self.min_hand, fill=theme.hand)
+        c.itemconfig(self.sec_hand, fill=theme.second_hand)
+        c.itemconfig(self.dot, fill=theme.second_hand, outline=theme.ink)
+        if self.size:
+            self._set_background()
+        # Спрайты того же атласа, но другого цвета
+        self._placed = [None, None, None]
+        self._place_hands()
+
+    def rebuild(self):
+        """Полное пересоздание — только при смене структуры циферблата."""
+        self.canvas.delete(TAG)
+        self.built = False
+        if self.size:
+            self.layout(self.width, self.height, force=True)
+
+    # ---------- раскладка под размер ----------
+
+    def layout(self, w, h, force=False):
+        """Подгоняет готовые элементы под холст w×h.
+
+        Если циферблат уже разложен ровно под этот размер, ничего не
+        делает (``force=True`` — всё равно пройти целиком).
+        """
+        if self.built and not force and self.laid_out == (w, h):
+            return
+        if not self.built:
+            self.build()
+
+        c = self.canvas
+        size = min(w, h)
+        self.width = w
+        self.height = h
+        self.laid_out = (w, h)
+        self.size = size
+        self.cx = cx = w / 2
+        self.cy = cy = h / 2
+        self.radius = radius = size / 2 - self.margin
+
+        self._set_background()
+        c.coords(self.background, cx, cy)
+
+        hands = (self.hour_hand, self.min_hand, self.sec_hand)
+        widths = [
+            max(int(size / div), low)
+            for div, low in zip(self.hand_divisors, self.hand_min)
+        ]
+        for item, width in zip(hands, widths):
+            c.itemconfig(item, width=width)
+        if self.antialias:
+            self._update_atlases(widths)
+
+        dot_r = max(int(size / 80), self.dot_min)
+        c.coords(self.dot, cx - dot_r, cy - dot_r, cx + dot_r, cy + dot_r)
+
+        self._placed = [None, None, None]
+        self._place_hands()
+
+    def _update_atlases(self, widths):
+        """Атласы под новые длины и толщины; старые рисовать незачем."""
+        for i, (length, width, steps) in enumerate(
+            zip(HAND_LENGTHS, widths, SPRITE_STEPS)
+        ):
+            key = atlas_key(length * self.radius, width, steps)
+            atlas = self._atlases[i]
+            if atlas is not None and atlas.key == key:
+                continue
+            if atlas is not None:
+                atlas_pool.release(atlas)
+            self._atlases[i] = atlas_pool.acquire(key)
+
+    def release_atlases(self):
+        """Отпустить атласы (перед масштабированием или закрытием окна)."""
+        for atlas in self._atlases:
+            if atlas is not None:
+                atlas_pool.release(atlas)
+        self._atlases = [None, None, None]
+
+    def close(self):
+        """Холст закрывается: отпустить атласы и ждущую картинку фона."""
+        self.release_atlases()
+        if self._dial_request is not None:
+            self._dial_request.cancel()
+            self._dial_request = None
+
+    def _set_background(self):
+        font_px = max(int(self.size / 18), self.min_font)
+        if self._dial_request is not None:
+            self._dial_request.cancel()
+        image, self._dial_request = request_dial(
+            self.canvas, self.radius, font_px, self.theme.dial_colors,
+            self._show_background
+        )
+        if image is not None:
+            self._show_background(image)
+
+    def _show_background(self, image):
+        self._dial_request = None
+        self._dial_image = image
+        self.canvas.itemconfig(self.background, image=image)
+
+    def scale_to(self, w, h):
+        """Дешёвое масштабирование готовых элементов (во время drag)."""
+        new_radius = min(w, h) / 2 - self.margin
+        if not self.built or self.radius <= 0 or new_radius <= 0:
+            return
+
+        k = new_radius / self.radius
+        self.canvas.move(TAG, w / 2 - self.cx, h / 2 - self.cy)
+        self.canvas.scale(TAG, w / 2, h / 2, k, k)
+        self.laid_out = None
+        self.width = w
+        self.height = h
+        self.cx = w / 2
+        self.cy = h / 2
+        self.radius = new_radius
+
+        # Картинки не масштабируются: до полной раскладки — линии Tk
+        if self.antialias:
+            self.release_atlases()
+            self._placed = [None, None, None]
+            self._place_hands()
+
+    # ---------- стрелки ----------
+
+    def set_hands(self, turn_hour, turn_min, turn_sec):
+        """Ставит стрелки; аргументы — доли оборота (0..1, 0 — вверх).
+
+        Если положение не изменилось, холст не трогаем. Все сдвиги
+        уходят в Tcl одним вызовом (или вместе с кадром приложения).
+        """
+        turns = (turn_hour, turn_min, turn_sec)
+        if turns == self.angles:
+            return
+        self.angles = turns
+        with self.batch:
+            self._place_hands()
+
+    def _place_hands(self):
+        if not self.built or self.radius <= 0:
+            return
+
+        c = self.canvas
+        batch = self.batch
+        cx, cy, radius = self.cx, self.cy, self.radius
+        hands = (self.hour_hand, self.min_hand, self.sec_hand)
+        colors = (self.theme.hand, self.theme.hand, self.theme.second_hand)
+        for i, (item, turn, length) in enumerate(
+            zip(hands, self.angles, HAND_LENGTHS)
+        ):
+            index = geometry.hand_index(turn)
+            sprite = None
+            atlas = self._atlases[i]
+            if atlas is not None:
+                sprite = atlas.image(
+                    c, int(turn * atlas.steps + 0.5) % atlas.steps, colors[i]
+                )
+
+            # Стрелка осталась на том же шаге таблицы (и спрайт тот же) —
+            # не трогаем её, иначе Tk зря перерисует её рамку
+            placed = (index, sprite)
+            if placed == self._placed[i]:
+                continue
+            self._placed[i] = placed
+
+            if sprite is None:
+                ux, uy = geometry.HANDS[index]
+                length *= radius
+                batch.coords(c, item, cx, cy,
+                             cx + length * ux, cy + length * uy)
+            else:
+                image, x, y = sprite
+                batch.itemconfig(c, self.sprites[i], image=image)
+                batch.coords(c, self.sprites[i], cx + x, cy + y)
+            self._show_sprite(i, sprite is not None)
+
+    def _show_sprite(self, i, shown):
+        if shown == self._sprite_shown[i]:
+            return
+        self._sprite_shown[i] = shown
+        c = self.canvas
+        self.batch.itemconfig(c, self.sprites[i],
+                              state="normal" if shown else "hidden")
+        self.batch.itemconfig(
+            c, (self.hour_hand, self.min_hand, self.sec_hand)[i],
+            state="hidden" if shown else "normal"
+        )
@@ -0,0 +1,69 @@
+"""Общий кэш шрифтов с фиксированной лестницей размеров.
+
+``Font.configure(size=...)`` на каждое ``<Configure>`` заставляет Tk
+перезагружать шрифт и перекладывать текст. Вместо этого размеры
+округляются до ступеней FONT_STEPS, на каждую тройку
+(семейство, размер, насыщенность) создаётся один ``Font`` на всё
+приложение, а ширина текста и высота строки запоминаются.
+"""
+
+from bisect import bisect_right
+
+from tkinter import font as tkfont
+
+FONT_STEPS = (8, 9, 10, 11, 12, 14, 16, 18, 20, 22, 24, 28, 32, 36, 40,
+              48, 56, 64, 72, 84, 96, 112, 128)
+
+
+def snap(size, steps=FONT_STEPS):
+    """Ближайшая ступень не больше size (но не меньше самой малой)."""
+    i = bisect_right(steps, size)
+    return steps[max(i - 1, 0)]
+
+
+class FontCache:
+    def __init__(self):
+        self._fonts = {}
+        self._extents = {}
+
+    def get(self, family, size, weight="normal", root=None):
+        key = (family, size, weight)
+        font = self._fonts.get(key)
+        if font is None:
+            font = tkfont.Font(root=root, family=family, size=size,
+                               weight=weight)
+            self._fonts[key] = font
+        return font
+
+    def extent(self, family, size, weight, text, root=None):
+        """(ширина текста, высота строки) в пикселях — из кэша."""
+        key = (family, size, weight, text)
+        ext = self._extents.get(key)
+        if ext is None:
+            font = self.get(family, size, weight, root)
+            ext = (font.measure(text), font.metrics("linespace"))
+            self._extents[key] = ext
+        return ext
+
+    def fit(self, family, weight, text, width, height, root=None,
+            steps=FONT_STEPS):
+        """Самая крупная ступень, при которой text влезает в width×height.
+
+        Размер текста растёт вместе со ступенью, поэтому ищем бинарным
+        поиском: на один подбор — несколько замеров, и те из кэша.
+        """
+        lo, hi = 0, len(steps) - 1
+        best = steps[0]
+        while lo <= hi:
+            mid = (lo + hi) // 2
+            w, h = self.extent(family, steps[mid], weight, text, root)
+            if w <= width and h <= height:
+                best = steps[mid]
+                lo = mid + 1
+            else:
+                hi = mid - 1
+        return best
+
+
+# Общий кэш для всех карточек
+font_cache = FontCache()
@@ -0,0 +1,93 @@
+"""Пакетная отправка изменений кадра в Tcl.
+
+Каждый ``canvas.coords`` или ``label.config`` — отдельный переход
+Python → Tcl, и при многих карточках эти переходы занимают большую
+часть кадра. Внутри ``with batch:`` такие изменения не выполняются
+сразу, а копятся и уходят в Tcl одним вызовом при выходе из блока
+(вложенные блоки сливаются в один кадр). Вне блока всё выполняется
+немедленно, поэтому одни и те же методы годятся и там, и там.
+
+Команды передаются списком списков, а не текстом скрипта, поэтому
+ничего не нужно экранировать.
+"""
+
+_PROC = "::clock_frame_commit"
+# Каждая команда — список, выполняется на глобальном уровне (как call)
+_PROC_BODY = "foreach cmd $cmds {uplevel #0 $cmd}"
+
+
+def _flatten(options):
+    args = []
+    for name, value in options.items():
+        args.append("-" + name)
+        args.append(value)
+    return args
+
+
+class FrameBatch:
+    def __init__(self, interp):
+        self.tk = interp
+        self.tk.call("proc", _PROC, "cmds", _PROC_BODY)
+        self.pending = []
+        self.depth = 0
+        # Итого: команд отправлено пакетами и самих пакетов (вызовов Tcl)
+        self.commands = 0
+        self.commits = 0
+
+    @property
+    def saved(self):
+        """Сколько переходов в Tcl сэкономлено с начала работы."""
+        return self.commands - self.commits
+
+    def __enter__(self):
+        self.depth += 1
+        return self
+
+    def __exit__(self, *exc):
+        self.depth -= 1
+        if self.depth == 0:
+            self.commit()
+        return False
+
+    def call(self, *args):
+        if self.depth:
+            self.pending.append(args)
+        else:
+            self.tk.call(*args)
+
+    def commit(self):
+        if not self.pending:
+            return
+        commands, self.pending = self.pending, []
+        if len(commands) == 1:
+            self.tk.call(*commands[0])
+        else:
+            self.tk.call(_PROC, commands)
+        self.commands += len(commands)
+        self.commits += 1
+
+    # ---------- то же, что методы виджетов tkinter ----------
+
+    def coords(self, canvas, item, *coords):
+        self.call(str(canvas), "coords", item, *coords)
+
+    def itemconfig(self, canvas, item, **options):
+        self.call(str(canvas), "itemconfigure", item, *_flatten(options))
+
+    def configure(self, widget, **options):
+        self.call(str(widget), "configure", *_flatten(options))
+
+    def stats(self):
+        return {"commands": self.commands, "commits": self.commits,
+                "saved": self.saved}
+
+
+# Один пакет на интерпретатор Tcl: его делят приложение и циферблаты
+_batches = {}
+
+
+def frame_batch(widget):
+    batch = _batches.get(widget.tk)
+    if batch is None:
+        batch = _batches[widget.tk] = FrameBatch(widget.tk)
+    return batch
@@ -0,0 +1,93 @@
+"""Таблицы единичных векторов циферблата, считаются один раз при импорте.
+
+Векторы уже в экранных осях (y вниз): угол 0 — вверх, дальше по часовой.
+Чтобы получить точку, достаточно умножить вектор на радиус и прибавить
+центр — никаких sin/cos на каждом кадре.
+"""
+
+import math
+
+try:
+    import numpy as np
+except ImportError:  # NumPy не обязателен
+    np = None
+
+# Разрешение таблицы стрелок: 3600 шагов = 0.1° на шаг
+HAND_STEPS = 3600
+
+
+def _unit(degrees):
+    angle = math.radians(degrees)
+    return (math.sin(angle), -math.cos(angle))
+
+
+TICKS = tuple(_unit(i * 6) for i in range(60))
+NUMERALS = tuple(_unit(h * 30) for h in range(1, 13))
+HANDS = tuple(_unit(i * 360 / HAND_STEPS) for i in range(HAND_STEPS))
+
+# Доля радиуса, с которой начинается риска (часовая длиннее)
+TICK_INNER = tuple(0.88 if i % 5 == 0 else 0.93 for i in range(60))
+
+if np is not None:
+    _TICKS_NP = np.array(TICKS)
+    _NUMERALS_NP = np.array(NUMERALS)
+    _TICK_INNER_NP = np.array(TICK_INNER)
+
+
+def hand_index(turn):
+    """Номер шага в таблице HANDS; turn — доля оборота (0..1)."""
+    return int(turn * HAND_STEPS + 0.5) % HAND_STEPS
+
+
+def hand_vector(turn):
+    """Единичный вектор стрелки; turn — доля оборота (0..1)."""
+    return HANDS[hand_index(turn)]
+
+
+def hand_turns(now, sweep=True):
+    """Положения часовой, минутной и секундной стрелок (доли оборота)
+    для datetime ``now``. Без ``sweep`` секундная стрелка идёт шагами."""
+    second = now.second
+    if sweep:
+        second += now.microsecond / 1_000_000
+    minute = now.minute + second / 60.0
+    hour = (now.hour % 12) + minute / 60.0
+    return hour / 12, minute / 60, second / 60
+
+
+def day_turns(seconds, sweep=True):
+    """То же, что hand_turns(), но от секунд с полуночи (float) — без
+    datetime; удобно, когда циферблатов сотни."""
+    if not sweep:
+        seconds = int(seconds)
+    minute = (seconds % 3600) / 60.0
+    hour = (seconds / 3600.0) % 12
+    return hour / 12, minute / 60, (seconds % 60) / 60
+
+
+def hand_point(turn, cx, cy, length):
+    ux, uy = hand_vector(turn)
+    return cx + length * ux, cy + length * uy
+
+
+def tick_segments(cx, cy, radius):
+    """Отрезки всех 60 рисок: список (x1, y1, x2, y2)."""
+    if np is not None:
+        outer = _TICKS_NP * radius
+        inner = outer * _TICK_INNER_NP[:, None]
+        seg = np.hstack((inner, outer)) + (cx, cy, cx, cy)
+        return seg.tolist()
+
+    return [
+        (cx + inner * radius * ux, cy + inner * radius * uy,
+         cx + radius * ux, cy + radius * uy)
+        for (ux, uy), inner in zip(TICKS, TICK_INNER)
+    ]
+
+
+def numeral_points(cx, cy, radius):
+    """Центры цифр 1..12 на окружности радиуса radius."""
+    if np is not None:
+        return (_NUMERALS_NP * radius + (cx, cy)).tolist()
+
+    return [(cx + radius * ux, cy + radius * uy) for ux, uy in NUMERALS]
@@ -0,0 +1,122 @@
+"""Замеры горячих мест: кольцевые буферы с перцентилями.
+
+Пока замеры выключены, ``timer()`` возвращает пустой контекст и почти
+ничего не стоит, поэтому вызовы можно оставлять в коде навсегда.
+"""
+
+import json
+import os
+import time
+from array import array
+from contextlib import nullcontext
+
+_NULL = nullcontext()
+
+
+class RingBuffer:
+    """Последние ``size`` значений фиксированного размера (без аллокаций)."""
+
+    def __init__(self, size=512):
+        self.size = size
+        self.values = array("d", bytes(8 * size))
+        self.count = 0  # сколько всего записано (может быть больше size)
+
+    def add(self, value):
+        self.values[self.count % self.size] = value
+        self.count += 1
+
+    def filled(self):
+        return self.values[:min(self.count, self.size)]
+
+    def percentiles(self, points=(50, 95, 99)):
+        data = sorted(self.filled())
+        if not data:
+            return {f"p{p}": 0.0 for p in points}
+        last = len(data) - 1
+        return {f"p{p}": data[min(int(len(data) * p / 100), last)]
+                for p in points}
+
+
+class _Timer:
+    __slots__ = ("metrics", "name", "t0")
+
+    def __init__(self, metrics, name):
+        self.metrics = metrics
+        self.name = name
+
+    def __enter__(self):
+        self.t0 = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.metrics.record(self.name, time.perf_counter() - self.t0)
+        return False
+
+
+class Metrics:
+    def __init__(self, enabled=False, size=512):
+        self.enabled = enabled
+        self.size = size
+        self.buffers = {}
+
+    def record(self, name, seconds):
+        if not self.enabled:
+            return
+        buf = self.buffers.get(name)
+        if buf is None:
+            buf = self.buffers[name] = RingBuffer(self.size)
+        buf.add(seconds)
+
+    def timer(self, name):
+        """``with metrics.timer("relayout"): ...``"""
+        if not self.enabled:
+            return _NULL
+        return _Timer(self, name)
+
+    def snapshot(self):
+        """{имя: {count, p50, p95, p99, max}} в миллисекундах."""
+        result = {}
+        for name, buf in sorted(self.buffers.items()):
+            data = buf.filled()
+            stats = {k: v * 1000 for k, v in buf.percentiles().items()}
+            stats["max"] = max(data) * 1000 if data else 0.0
+            stats["count"] = buf.count
+            result[name] = stats
+        return result
+
+    def dump(self, path):
+        """Атомарно записывает snapshot() в JSON."""
+        tmp = f"{path}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"time": time.time(), "metrics": self.snapshot()},
+                      f, indent=2)
+        os.replace(tmp, path)
+
+
+class StartupTimer:
+    """Разбивка времени старта: импорт, Tk, сборка карточек, первый кадр.
+
+    ``mark()`` — длительность этапа от предыдущей отметки, ``add()`` —
+    копит время разбросанного по старту этапа, ``at()`` — момент от
+    самого начала.
+    """
+
+    def __init__(self, start=None):
+        self.t0 = time.perf_counter() if start is None else start
+        self.last = self.t0
+        self.phases = {}
+
+    def mark(self, name):
+        now = time.perf_counter()
+        self.phases[name] = (now - self.last) * 1000
+        self.last = now
+
+    def add(self, name, seconds):
+        self.phases[name] = self.phases.get(name, 0.0) + seconds * 1000
+
+    def at(self, name):
+        if name not in self.phases:
+            self.phases[name] = (time.perf_counter() - self.t0) * 1000
+
+    def report(self):
+        return "  ".join(f"{k}={v:.1f}ms" for k, v in self.phases.items())
@@ -0,0 +1,152 @@
+"""Круги секундомера: миллионы отметок без миллионов объектов.
+
+Хранится только общее время на каждой отметке (split) — целые
+наносекунды в ``array('q')``, 8 байт на круг; длительность круга —
+разность соседних отметок. Самый быстрый и самый медленный круги
+обновляются на каждой отметке, без прохода по всему списку.
+
+Экспорт идёт потоком, кусками по CHUNK отметок: ни списка строк, ни
+копии массива целиком в памяти не появляется. Экспорт — генератор,
+один шаг — один кусок, поэтому интерфейс может писать длинную сессию
+понемногу, между кадрами, не замирая.
+"""
+
+import array
+import csv
+import struct
+import sys
+
+from timebase import format_duration
+
+# Отметок за шаг экспорта: кусок CSV пишется за десятки миллисекунд
+CHUNK = 4096
+
+# Двоичный формат: заголовок, затем отметки int64 little-endian (нс)
+BINARY_MAGIC = b"LAPS"
+BINARY_VERSION = 1
+_HEADER = struct.Struct("<4sHQ")  # сигнатура, версия, число отметок
+_ITEM = 8
+
+CSV_HEADER = ("lap", "lap_ns", "split_ns", "lap_time", "split_time")
+
+
+class LapLog:
+    def __init__(self):
+        self.splits = array.array("q")
+        # Индексы самого быстрого и самого медленного кругов (или None)
+        self.fastest = None
+        self.slowest = None
+
+    def __len__(self):
+        return len(self.splits)
+
+    def add(self, split_ns):
+        """Новая отметка (общее время, нс); возвращает индекс круга."""
+        splits = self.splits
+        if splits and split_ns < splits[-1]:
+            raise ValueError("отметки кругов должны идти по возрастанию")
+        splits.append(split_ns)
+        index = len(splits) - 1
+        lap = self.lap(index)
+        if self.fastest is None or lap < self.lap(self.fastest):
+            self.fastest = index
+        if self.slowest is None or lap > self.lap(self.slowest):
+            self.slowest = index
+        return index
+
+    def clear(self):
+        # Новый массив, а не del [:] — память длинной сессии освобождается
+        self.splits = array.array("q")
+        self.fastest = None
+        self.slowest = None
+
+    def split(self, index):
+        return self.splits[index]
+
+    def lap(self, index):
+        return self.splits[index] - (self.splits[index - 1] if index else 0)
+
+    def rows(self, start=0, stop=None):
+        """(номер круга с 1, круг нс, общее нс) — лениво, без списка."""
+        splits = self.splits
+        stop = len(splits) if stop is None else min(stop, len(splits))
+        previous = splits[start - 1] if start > 0 else 0
+        for index in range(start, stop):
+            split = splits[index]
+            yield index + 1, split - previous, split
+            previous = split
+
+    # ---------- экспорт ----------
+    # Пишутся круги, отмеченные до начала экспорта: новые отметки и даже
+    # сброс во время записи файл не портят
+
+    def write_csv(self, f, digits=3):
+        """CSV в открытый текстовый файл (newline=""); генератор: шаг —
+        CHUNK строк, выдаёт число записанных кругов."""
+        splits, count = self.splits, len(self.splits)
+        writer = csv.writer(f)
+        writer.writerow(CSV_HEADER)
+        previous = 0
+        for start in range(0, count, CHUNK):
+            rows = []
+            for index in range(start, min(start + CHUNK, count)):
+                split = splits[index]
+                lap = split - previous
+                previous = split
+                rows.append((index + 1, lap, split,
+                             format_duration(lap, digits),
+                             format_duration(split, digits)))
+            writer.writerows(rows)
+            yield start + len(rows)
+
+    def write_binary(self, f):
+        """Заголовок и отметки в открытый двоичный файл; генератор, как
+        write_csv."""
+        splits, count = self.splits, len(self.splits)
+        f.write(_HEADER.pack(BINARY_MAGIC, BINARY_VERSION, count))
+        for start in range(0, count, CHUNK):
+            chunk = splits[start:start + CHUNK]
+            if sys.byteorder != "little":
+                chunk.byteswap()
+            f.write(chunk.tobytes())
+            yield start + len(chunk)
+
+    def export_steps(self, f, path, digits=3):
+        """Шаги экспорта в открытый файл f; формат — по расширению path."""
+        if path.lower().endswith(".csv"):
+            return self.write_csv(f, digits)
+        return self.write_binary(f)
+
+    def export(self, path, digits=3):
+        """Весь экспорт за раз: .csv — текст, иначе двоичный формат."""
+        count = len(self.splits)
+        with open_export(path) as f:
+            for _ in self.export_steps(f, path, digits):
+                pass
+        return count
+
+
+def open_export(path):
+    if path.lower().endswith(".csv"):
+        return open(path, "w", newline="", encoding="utf-8")
+    return open(path, "wb")
+
+
+def read_binary(f):
+    """Отметки из двоичного файла — генератором, кусками по CHUNK."""
+    header = f.read(_HEADER.size)
+    if len(header) < _HEADER.size:
+        raise ValueError("файл кругов обрезан")
+    magic, version, count = _HEADER.unpack(header)
+    if magic != BINARY_MAGIC or version != BINARY_VERSION:
+        raise ValueError("не файл кругов секундомера")
+    while count:
+        n = min(count, CHUNK)
+        chunk = array.array("q")
+        chunk.frombytes(f.read(n * _ITEM))
+        if len(chunk) < n:
+            raise ValueError("файл кругов обрезан")
+        if sys.byteorder != "little":
+            chunk.byteswap()
+        yield from chunk
+        count -= n
@@ -1,25 +1,85 @@
+import time
+
+# Отметка до всех импортов — чтобы знать, сколько стоит сам импорт
+_import_started = time.perf_counter()
+
 import tkinter as tk
-from tkinter import font as tkfont
+from tkinter import filedialog
+import argparse
 import datetime
-import time
+import inspect
+import itertools
 import math
+import os
+import sys
+
+from alarms import ALARM, AlarmQueue, load_timers
+from control import INVALID_PARAMS, METHOD_NOT_FOUND, ControlError, \
+    ControlServer
+from dial import request_dial
+from face import CARD_STYLE, HAND_LENGTHS, ClockFace
+from fonts import font_cache, snap
+from frame import frame_batch
+from geometry import HANDS, day_turns, hand_index, hand_turns
+from instrument import Metrics, StartupTimer
+from laps import LapLog, open_export
+from layout_engine import (
+    SlotIndex, column_keys, diff_positions, grid_positions, row_count
+)
+from redraw import RedrawScheduler
+from scheduler import LOW_POWER, TickScheduler, WindowVisibility
+from themes import DEFAULT_THEME, THEMES, ThemedWidgets, next_theme
+from timebase import NS_PER_SEC, Countdown, Span, format_duration, now_ns
+from worldclock import ZoneTable, check_zones, parse_zones
+
+# Период обновления цифр с сотыми/тысячными (частота кадров экрана)
+DISPLAY_INTERVAL = 1 / 50
+
+
+def parse_hms(text):
+    """«ч:м:с», «м:с» или «с» -> (ч, м, с); None, если формат неверный."""
+    try:
+        parts = text.strip().split(":")
+        if len(parts) == 3:
+            h, m, s = parts
+        elif len(parts) == 2:
+            h = "0"
+            m, s = parts
+        elif len(parts) == 1:
+            h, m, s = "0", "0", parts[0]
+        else:
+            raise ValueError
+        return max(int(h), 0), max(int(m), 0), max(int(s), 0)
+    except ValueError:
+        return None
+
 
 # ---------------------------------------------------------
 # Базовый класс "карточки" (элемента, который можно таскать)
 # ---------------------------------------------------------
 
 class BaseCard(tk.Frame):
+    # Тикать ли карточку, когда она скрыта (например, идущий таймер)
+    tick_when_hidden = False
+
     def __init__(self, parent, app, key, title):
-        super().__init__(parent, bg="#222222", bd=1, relief="raised")
+        super().__init__(parent, bd=1, relief="raised")
         self.app = app
         self.key = key
+        self.theme = app.theme
+
+        # Последние записанные в виджеты значения (чтобы не дёргать Tk зря)
+        self._widget_state = {}
+        # Виджеты и роли их цветов (перекрашиваются при смене темы)
+        self.themed = ThemedWidgets()
+        self.paint(self, bg="window")
 
         # Шапка для перетаскивания
-        header = tk.Frame(self, bg="#444444")
+        header = self.paint(tk.Frame(self), bg="header")
         header.pack(fill="x")
-        title_lbl = tk.Label(
-            header, text=title, bg="#444444",
-            fg="#ffffff", anchor="w"
+        title_lbl = self.paint(
+            tk.Label(header, text=title, anchor="w"),
+            bg="header", fg="text"
         )
         title_lbl.pack(side="left", padx=4, pady=2)
 
@@ -28,17 +88,57 @@ class BaseCard(tk.Frame):
             w.bind("<Button-1>", self._on_header_press)
 
         # Тело карточки (сюда кладём содержимое)
-        self.body = tk.Frame(self, bg="#222222")
+        self.body = self.paint(tk.Frame(self), bg="window")
         self.body.pack(fill="both", expand=True)
 
     def _on_header_press(self, event):
         # Сообщаем приложению, что начали перетаскивать эту карточку
         self.app.start_drag(self.key)
 
+    def refresh_interval(self):
+        """Как часто карточке нужен tick (секунды) или None, если обновлять
+        нечего. Тики приходят на границах этого периода по настенному
+        времени: для 1.0 — сразу после смены секунды."""
+        return None
+
+    def next_event(self):
+        """Через сколько секунд карточке нужен tick, даже если её не видно
+        (например, конец отсчёта), или None."""
+        return None
+
+    def paint(self, widget, **roles):
+        """Красит виджет цветами темы по ролям и запоминает роли."""
+        self.themed.add(widget, **roles)
+        self.update_widget(widget, **{
+            option: getattr(self.theme, role) for option, role in roles.items()
+        })
+        return widget
+
+    def apply_theme(self, theme):
+        """Перекрасить карточку; наследники докрашивают своё."""
+        self.theme = theme
+        self.themed.apply(theme, self.update_widget)
+
+    def update_widget(self, widget, **options):
+        """widget.config(...) только для реально изменившихся опций.
+
+        Внутри кадра (``with app.frame``) изменение копится и уходит в Tcl
+        вместе со всем кадром."""
+        state = self._widget_state.setdefault(widget, {})
+        changed = {k: v for k, v in options.items() if state.get(k) != v}
+        if changed:
+            self.app.frame.configure(widget, **changed)
+            state.update(changed)
+
     def tick(self, now_dt, now_ts):
         """Переопределяется в наследниках."""
         pass
 
+    def close(self):
+        """Окно закрывается: снять свои after-задания (иначе они сработают
+        на уничтоженных виджетах) и отпустить общие ресурсы (атласы)."""
+        pass
+
 
 # ---------------------------------------------------------
 # Аналоговые часы
@@ -48,19 +148,39 @@ class AnalogClockCard(BaseCard):
     def __init__(self, parent, app):
         super().__init__(parent, app, "A", "Аналоговые часы (A)")
 
-        self.canvas = tk.Canvas(self.body, bg="#222222", highlightthickness=0)
+        # Плавная секундная стрелка (25 раз в секунду) или шаг раз в секунду
+        self.sweep = app.sweep
+
+        self.canvas = self.paint(
+            tk.Canvas(self.body, highlightthickness=0), bg="window"
+        )
         self.canvas.pack(fill="both", expand=True)
 
         self.canvas.bind("<Configure>", self.on_resize)
 
-        self.cx = self.cy = 0
-        self.radius = 0
-        self.hour_hand = None
-        self.min_hand = None
-        self.sec_hand = None
+        # Элементы циферблата создаются один раз и дальше только двигаются;
+        # стрелки — сглаженные спрайты, атлас рисуется в фоне
+        self.face = ClockFace(self.canvas, theme=self.theme, antialias=True,
+                              **CARD_STYLE)
+
+        self.redraw_scheduler = RedrawScheduler(
+            self.canvas, self.redraw, fast=self.scale_only
+        )
 
     def on_resize(self, event):
-        self.redraw()
+        self.redraw_scheduler.request()
+
+    def scale_only(self):
+        """Быстрый путь во время перетаскивания: масштабируем готовое."""
+        if not self.face.built:
+            # Масштабировать пока нечего — сразу рисуем полностью
+            self.redraw()
+            return
+        w = self.canvas.winfo_width()
+        h = self.canvas.winfo_height()
+        if min(w, h) < 50:
+            return
+        self.face.scale_to(w, h)
 
     def redraw(self):
         w = self.canvas.winfo_width()
@@ -69,121 +189,197 @@ class AnalogClockCard(BaseCard):
         if size < 50:
             return
 
-        self.canvas.delete("all")
-
-        self.cx = w / 2
-        self.cy = h / 2
-        self.radius = size / 2 - 10
-
-        edge_color = (220, 220, 220)
-        center_color = (255, 255, 255)
-        r_int = int(self.radius)
-
-        # Градиентный фон
-        for i in range(r_int, 0, -1):
-            t = i / self.radius
-            r = int(edge_color[0] * t + center_color[0] * (1 - t))
-            g = int(edge_color[1] * t + center_color[1] * (1 - t))
-            b = int(edge_color[2] * t + center_color[2] * (1 - t))
-            color = f"#{r:02x}{g:02x}{b:02x}"
-            self.canvas.create_oval(
-                self.cx - i, self.cy - i,
-                self.cx + i, self.cy + i,
-                outline=color, fill=color
-            )
+        with self.app.metrics.timer("redraw.A"):
+            self.face.layout(w, h)
 
-        # Внешняя граница
-        self.canvas.create_oval(
-            self.cx - self.radius, self.cy - self.radius,
-            self.cx + self.radius, self.cy + self.radius,
-            width=4, outline="#000000"
-        )
+    def apply_theme(self, theme):
+        super().apply_theme(theme)
+        self.face.set_theme(theme)
 
-        # Риски
-        for i in range(60):
-            angle = math.radians(i * 6)
-            if i % 5 == 0:
-                inner = self.radius * 0.88
-                width_line = 4
-            else:
-                inner = self.radius * 0.93
-                width_line = 1
+    def refresh_interval(self):
+        return 0.04 if self.sweep else 1.0
 
-            x1 = self.cx + inner * math.sin(angle)
-            y1 = self.cy - inner * math.cos(angle)
-            x2 = self.cx + self.radius * math.sin(angle)
-            y2 = self.cy - self.radius * math.cos(angle)
+    def tick(self, now_dt, now_ts):
+        self.face.set_hands(*hand_turns(now_dt, sweep=self.sweep))
 
-            self.canvas.create_line(
-                x1, y1, x2, y2,
-                fill="#000000", width=width_line
-            )
+    def close(self):
+        self.redraw_scheduler.cancel()
+        self.face.close()
 
-        # Цифры
-        num_radius = self.radius * 0.75
-        font_size = max(int(size / 18), 8)
-        for h_ in range(1, 13):
-            angle = math.radians(h_ * 30)
-            x = self.cx + num_radius * math.sin(angle)
-            y = self.cy - num_radius * math.cos(angle)
-            self.canvas.create_text(
-                x, y,
-                text=str(h_),
-                font=("Arial", font_size, "bold")
-            )
 
-        # Толщина стрелок масштабируем
-        size_factor = size / 500
-        hour_w = max(int(8 * size_factor), 3)
-        min_w = max(int(4 * size_factor), 2)
-        sec_w = max(int(2 * size_factor), 1)
+# ---------------------------------------------------------
+# Стена мировых часов
+# ---------------------------------------------------------
+
+class WorldClockCard(BaseCard):
+    """Много маленьких циферблатов (по часовому поясу) на одном холсте.
 
-        # Стрелки
-        self.hour_hand = self.canvas.create_line(
-            self.cx, self.cy, self.cx, self.cy - self.radius * 0.5,
-            width=hour_w, fill="#000000", capstyle=tk.ROUND
-        )
-        self.min_hand = self.canvas.create_line(
-            self.cx, self.cy, self.cx, self.cy - self.radius * 0.75,
-            width=min_w, fill="#000000", capstyle=tk.ROUND
+    Все циферблаты одного размера, поэтому фон у них — одна и та же
+    кэшированная картинка. Стрелки всех циферблатов двигаются пакетом
+    кадра: ``coords`` только для сдвинувшихся стрелок, а в Tcl — один
+    вызов вместо сотен.
+    """
+
+    def __init__(self, parent, app):
+        super().__init__(parent, app, "W", "Мировое время (W)")
+        self.zones = ZoneTable(app.world_zones)
+
+        self.canvas = self.paint(
+            tk.Canvas(self.body, highlightthickness=0), bg="window"
         )
-        self.sec_hand = self.canvas.create_line(
-            self.cx, self.cy, self.cx, self.cy - self.radius * 0.85,
-            width=sec_w, fill="#ff0000", capstyle=tk.ROUND
+        self.canvas.pack(fill="both", expand=True)
+        self.canvas.bind("<Configure>", self.on_resize)
+        self.redraw_scheduler = RedrawScheduler(
+            self.canvas, self.redraw, fast=self.move_only
         )
 
-        # Центральная точка
-        dot_r = max(int(size / 80), 4)
-        self.canvas.create_oval(
-            self.cx - dot_r, self.cy - dot_r,
-            self.cx + dot_r, self.cy + dot_r,
-            fill="#ff0000", outline="#000000", width=2
-        )
+        # Элементы циферблатов: [(фон, часовая, минутная, секундная, подпись)]
+        self.dials = []
+        self.centers = []
+        self.radius = 0
+        self._dial_image = None
+        self._dial_request = None
+        # Индексы в таблице стрелок, уже выставленные: по 3 на циферблат
+        self._placed = []
+        self._build()
+
+    def _build(self):
+        c = self.canvas
+        theme = self.theme
+        for label in self.zones.labels:
+            self.dials.append((
+                c.create_image(0, 0, tags="wc_dial"),
+                c.create_line(0, 0, 0, 0, fill=theme.hand,
+                              capstyle=tk.ROUND, tags="wc_hand"),
+                c.create_line(0, 0, 0, 0, fill=theme.hand,
+                              capstyle=tk.ROUND, tags="wc_hand"),
+                c.create_line(0, 0, 0, 0, fill=theme.second_hand,
+                              capstyle=tk.ROUND, tags="wc_sec"),
+                c.create_text(0, 0, text=label, fill=theme.text_dim,
+                              anchor="n", tags="wc_label"),
+            ))
+        self._placed = [None] * (3 * len(self.dials))
 
-    def tick(self, now_dt, now_ts):
-        if not self.radius or not self.hour_hand:
+    def on_resize(self, event):
+        self.redraw_scheduler.request()
+
+    @staticmethod
+    def _grid_shape(count, w, h):
+        """(столбцов, сторона ячейки): самые крупные квадратные ячейки."""
+        best = (1, 0)
+        for cols in range(1, count + 1):
+            rows = math.ceil(count / cols)
+            cell = min(w / cols, h / rows)
+            if cell > best[1]:
+                best = (cols, cell)
+        return best
+
+    def redraw(self):
+        w = self.canvas.winfo_width()
+        h = self.canvas.winfo_height()
+        if not self.dials or min(w, h) < 20:
             return
 
-        second = now_dt.second
-        minute = now_dt.minute + second / 60.0
-        hour = (now_dt.hour % 12) + minute / 60.0
+        with self.app.metrics.timer("redraw.W"):
+            self._layout(w, h)
 
-        angle_sec = math.radians(second * 6)
-        angle_min = math.radians(minute * 6)
-        angle_hour = math.radians(hour * 30)
+    def move_only(self):
+        """Быстрый путь во время перетаскивания: без новой картинки фона."""
+        w = self.canvas.winfo_width()
+        h = self.canvas.winfo_height()
+        if self.dials and min(w, h) >= 20:
+            self._layout(w, h, dial=False)
+
+    def _layout(self, w, h, dial=True):
+        c = self.canvas
+        cols, cell = self._grid_shape(len(self.dials), w, h)
+        # Подписи — только если им хватает места
+        label_h = int(cell * 0.16) if cell >= 60 else 0
+        self.radius = radius = max((cell - label_h) / 2 - 3, 4)
+        if dial:
+            # Цифры на мелких циферблатах только мешают
+            font_px = max(int(radius / 7), 8) if radius >= 40 else 0
+            if self._dial_request is not None:
+                self._dial_request.cancel()
+            # Новая картинка рисуется в фоне, до тех пор — прежняя
+            image, self._dial_request = request_dial(
+                c, radius, font_px, self.theme.dial_colors, self._show_dial
+            )
+            if image is not None:
+                self._show_dial(image)
+
+        batch = self.app.frame
+        self.centers = []
+        with batch:
+            for i, (bg, _, _, _, label) in enumerate(self.dials):
+                row, col = divmod(i, cols)
+                cx = (col + 0.5) * cell
+                cy = row * cell + (cell - label_h) / 2
+                self.centers.append((cx, cy))
+                batch.coords(c, bg, cx, cy)
+                batch.coords(c, label, cx, cy + radius + 2)
+
+        c.itemconfig("wc_label", state="normal" if label_h else "hidden",
+                     font=("Arial", max(label_h // 2, 6)))
+        # Толщина стрелок — по тегу, один вызов на всех
+        c.itemconfig("wc_hand", width=max(int(radius / 20), 1))
+        c.itemconfig("wc_sec", width=max(int(radius / 40), 1))
+
+        self._placed = [None] * (3 * len(self.dials))
+        # Время кадра, а не своё: стрелки в шаг с остальными карточками
+        self._move_hands(self.app.loop.now_ts)
+
+    def _move_hands(self, now_ts):
+        """Все сдвинувшиеся стрелки — одним вызовом Tcl."""
+        if not self.centers:
+            return
+        c = self.canvas
+        batch = self.app.frame
+        radius = self.radius
+        placed = self._placed
+        with batch:
+            for d, (items, (cx, cy), seconds) in enumerate(zip(
+                self.dials, self.centers, self.zones.seconds_of_day(now_ts)
+            )):
+                turns = day_turns(seconds, sweep=False)
+                for k in range(3):
+                    index = hand_index(turns[k])
+                    slot = 3 * d + k
+                    if placed[slot] == index:
+                        continue
+                    placed[slot] = index
+                    ux, uy = HANDS[index]
+                    length = HAND_LENGTHS[k] * radius
+                    batch.coords(c, items[k + 1], cx, cy,
+                                 cx + length * ux, cy + length * uy)
+
+    def apply_theme(self, theme):
+        super().apply_theme(theme)
+        c = self.canvas
+        c.itemconfig("wc_hand", fill=theme.hand)
+        c.itemconfig("wc_sec", fill=theme.second_hand)
+        c.itemconfig("wc_label", fill=theme.text_dim)
+        if self.centers:
+            self.redraw()
+
+    def refresh_interval(self):
+        return 1.0
 
-        def get_xy(angle, length):
-            x = self.cx + length * math.sin(angle)
-            y = self.cy - length * math.cos(angle)
-            return x, y
+    def tick(self, now_dt, now_ts):
+        self._move_hands(now_ts)
 
-        xh, yh = get_xy(angle_hour, self.radius * 0.5)
-        xm, ym = get_xy(angle_min, self.radius * 0.75)
-        xs, ys = get_xy(angle_sec, self.radius * 0.85)
+    def _show_dial(self, image):
+        self._dial_request = None
+        # Своя ссылка: общий кэш может вытеснить картинку, и Tk
+        # удалит её вместе с последней ссылкой Python
+        self._dial_image = image
+        self.canvas.itemconfig("wc_dial", image=image)
 
-        self.canvas.coords(self.hour_hand, self.cx, self.cy, xh, yh)
-        self.canvas.coords(self.min_hand, self.cx, self.cy, xm, ym)
-        self.canvas.coords(self.sec_hand, self.cx, self.cy, xs, ys)
+    def close(self):
+        self.redraw_scheduler.cancel()
+        if self._dial_request is not None:
+            self._dial_request.cancel()
+            self._dial_request = None
 
 
 # ---------------------------------------------------------
@@ -194,21 +390,29 @@ class DigitalClockCard(BaseCard):
     def __init__(self, parent, app):
         super().__init__(parent, app, "D", "Цифровые часы (D)")
 
-        self.font = tkfont.Font(family="Consolas", size=32, weight="bold")
-        self.label = tk.Label(
-            self.body, text="00:00:00",
-            font=self.font, bg="#222222", fg="#ffffff"
+        self.font = font_cache.get("Consolas", 32, "bold", self)
+        self.label = self.paint(
+            tk.Label(self.body, text="00:00:00", font=self.font),
+            bg="window", fg="text"
         )
         self.label.pack(expand=True)
 
-        self.bind("<Configure>", self.on_resize)
+        self.body.bind("<Configure>", self.on_resize)
 
     def on_resize(self, event):
-        size = min(event.width // 7, event.height // 2)
-        self.font.configure(size=max(size, 10))
+        # Самая крупная ступень шрифта, при которой время влезает в карточку
+        size = font_cache.fit(
+            "Consolas", "bold", "00:00:00",
+            event.width - 16, event.height - 8, self
+        )
+        self.font = font_cache.get("Consolas", max(size, 10), "bold", self)
+        self.update_widget(self.label, font=self.font)
+
+    def refresh_interval(self):
+        return 1.0
 
     def tick(self, now_dt, now_ts):
-        self.label.config(text=now_dt.strftime("%H:%M:%S"))
+        self.update_widget(self.label, text=now_dt.strftime("%H:%M:%S"))
 
 
 # ---------------------------------------------------------
@@ -216,19 +420,30 @@ class DigitalClockCard(BaseCard):
 # ---------------------------------------------------------
 
 class StopwatchCard(BaseCard):
+    """Секундомер с кругами.
+
+    Круги хранятся отметками в ``LapLog`` (8 байт на круг), а на экране
+    всегда LAP_ROWS строк, новые сверху: колесо мыши листает, в строки
+    пишется только видимое. Список появляется с первым кругом.
+    """
+
+    LAP_ROWS = 5
+    # Самая широкая строка круга — по ней подбирается шрифт списка
+    LAP_SAMPLE = "9999999 ▲ 00:00:00.000  00:00:00.000"
+
     def __init__(self, parent, app):
         super().__init__(parent, app, "S", "Секундомер (S)")
 
-        self.display_font = tkfont.Font(family="Consolas", size=28, weight="bold")
-        self.button_font = tkfont.Font(family="Arial", size=12)
+        self.display_font = font_cache.get("Consolas", 28, "bold", self)
+        self.button_font = font_cache.get("Arial", 12, "normal", self)
 
-        self.label = tk.Label(
-            self.body, text="00:00:00",
-            font=self.display_font, bg="#222222", fg="#ffffff"
+        self.label = self.paint(
+            tk.Label(self.body, text="00:00:00", font=self.display_font),
+            bg="window", fg="text"
         )
         self.label.pack(pady=(10, 5), expand=True)
 
-        btn_frame = tk.Frame(self.body, bg="#222222")
+        btn_frame = self.paint(tk.Frame(self.body), bg="window")
         btn_frame.pack(pady=(0, 10))
 
         self.start_btn = tk.Button(
@@ -237,53 +452,254 @@ class StopwatchCard(BaseCard):
         )
         self.start_btn.pack(side="left", padx=5)
 
+        self.lap_btn = tk.Button(
+            btn_frame, text="Круг",
+            font=self.button_font, command=self.mark_lap
+        )
+        self.lap_btn.pack(side="left", padx=5)
+
         self.reset_btn = tk.Button(
             btn_frame, text="Сброс",
             font=self.button_font, command=self.reset
         )
         self.reset_btn.pack(side="left", padx=5)
 
-        self.running = False
-        self.elapsed = 0.0  # секунд
-        self.last_ts = None
+        # Круги: номер, длительность круга, общее время на отметке
+        self.laps = LapLog()
+        self.lap_offset = 0
+        self._export = None  # (файл, шаги) идущего экспорта
+        self._export_job = None
+        self.lap_font = font_cache.get("Consolas", 10, "normal", self)
+        self.small_font = font_cache.get("Arial", 10, "normal", self)
+        self.lap_frame = self.paint(tk.Frame(self.body), bg="window")
+        self.lap_rows = []
+        for i in range(self.LAP_ROWS):
+            row = self.paint(
+                tk.Label(self.lap_frame, text="", font=self.lap_font,
+                         anchor="w"),
+                bg="window", fg="text"
+            )
+            row.pack(fill="x", padx=6)
+            self.lap_rows.append(row)
+
+        lap_bar = self.paint(tk.Frame(self.lap_frame), bg="window")
+        lap_bar.pack(fill="x", padx=6, pady=(2, 4))
+        self.lap_status = self.paint(
+            tk.Label(lap_bar, text="", font=self.small_font, anchor="w"),
+            bg="window", fg="text_dim"
+        )
+        self.lap_status.pack(side="left", fill="x", expand=True)
+        self.export_btn = tk.Button(
+            lap_bar, text="Экспорт", font=self.small_font,
+            command=self.export_laps
+        )
+        self.export_btn.pack(side="right")
+
+        for widget in [self.lap_frame, self.lap_status] + self.lap_rows:
+            widget.bind("<MouseWheel>", self.on_wheel)
+            widget.bind("<Button-4>", lambda e: self.scroll_laps(-1))
+            widget.bind("<Button-5>", lambda e: self.scroll_laps(1))
+
+        # Прошедшее время — по монотонной шкале, без накопления ошибки
+        self.span = Span()
+        # Знаков после секунд: 0, 2 (сотые) или 3 (тысячные); клик по цифрам
+        self.digits = 0
+        self.label.bind("<Button-1>", self.cycle_digits)
+
+        self.body_size = (0, 0)
+        self.body.bind("<Configure>", self.on_resize)
 
-        self.bind("<Configure>", self.on_resize)
+    @property
+    def running(self):
+        return self.span.running
 
     def on_resize(self, event):
-        size = min(event.width // 7, event.height // 3)
-        self.display_font.configure(size=max(size, 10))
-        self.button_font.configure(size=max(int(size * 0.5), 8))
+        self.body_size = (event.width, event.height)
+        self._fit_fonts()
+
+    def _fit_fonts(self):
+        w, h = self.body_size
+        if not w:
+            return
+        # Под цифры — чуть больше половины высоты, остальное — кнопкам
+        # (и списку кругов, если он показан)
+        share = 0.3 if len(self.laps) else 0.55
+        size = font_cache.fit(
+            "Consolas", "bold", format_duration(0, self.digits),
+            w - 16, h * share, self
+        )
+        size = max(size, 10)
+        self.display_font = font_cache.get("Consolas", size, "bold", self)
+        self.button_font = font_cache.get(
+            "Arial", max(snap(size * 0.5), 8), "normal", self
+        )
+        self.update_widget(self.label, font=self.display_font)
+        for btn in (self.start_btn, self.lap_btn, self.reset_btn):
+            self.update_widget(btn, font=self.button_font)
+
+        # Список кругов: строки и строка состояния делят остаток высоты,
+        # но шрифт не крупнее кнопок
+        lap_size = font_cache.fit(
+            "Consolas", "normal", self.LAP_SAMPLE,
+            w - 16, h * 0.4 / (self.LAP_ROWS + 1), self
+        )
+        lap_size = max(min(lap_size, snap(size * 0.5)), 8)
+        self.lap_font = font_cache.get("Consolas", lap_size, "normal", self)
+        self.small_font = font_cache.get("Arial", lap_size, "normal", self)
+        for row in self.lap_rows:
+            self.update_widget(row, font=self.lap_font)
+        for widget in (self.lap_status, self.export_btn):
+            self.update_widget(widget, font=self.small_font)
 
     def _update_label(self):
-        total = int(self.elapsed)
-        h = total // 3600
-        m = (total % 3600) // 60
-        s = total % 60
-        self.label.config(text=f"{h:02d}:{m:02d}:{s:02d}")
+        text = format_duration(self.span.elapsed_ns(), self.digits)
+        self.update_widget(self.label, text=text)
+
+    def cycle_digits(self, event=None):
+        self.digits = {0: 2, 2: 3, 3: 0}[self.digits]
+        self._fit_fonts()
+        self._update_label()
+        self.app.wake()
 
     def toggle_start(self):
         if not self.running:
-            self.running = True
-            self.last_ts = time.time()
+            self.span.start()
             self.start_btn.config(text="Пауза")
+            self.app.wake()
         else:
-            self.running = False
-            self.last_ts = None
+            self.span.pause()
             self.start_btn.config(text="Старт")
+            self._update_label()
 
     def reset(self):
-        self.elapsed = 0.0
-        if self.running:
-            self.last_ts = time.time()
+        self.span.reset()
+        self.laps.clear()
+        self.lap_offset = 0
+        self._update_laps()
         self._update_label()
 
+    # ---------- круги ----------
+
+    def mark_lap(self):
+        """Отметить круг; на паузе ничего не делает. Индекс круга или None."""
+        if not self.running:
+            return None
+        index = self.laps.add(self.span.elapsed_ns())
+        if self.lap_offset:
+            # Листаем историю — новая строка сверху не сдвигает видимое
+            self.lap_offset += 1
+        self._update_laps()
+        return index
+
+    def on_wheel(self, event):
+        self.scroll_laps(-1 if event.delta > 0 else 1)
+
+    def scroll_laps(self, rows):
+        last = max(len(self.laps) - self.LAP_ROWS, 0)
+        self.lap_offset = min(max(self.lap_offset + rows, 0), last)
+        self._update_laps()
+
+    def _update_laps(self):
+        laps = self.laps
+        total = len(laps)
+        shown = bool(self.lap_frame.winfo_manager())
+        if shown != bool(total):
+            if total:
+                self.lap_frame.pack(fill="x")
+            else:
+                self.lap_frame.pack_forget()
+            self._fit_fonts()
+        if not total:
+            return
+
+        # Новые сверху: строка i — круг top - i
+        top = total - 1 - self.lap_offset
+        for i, row in enumerate(self.lap_rows):
+            index = top - i
+            if index < 0:
+                self.update_widget(row, text="")
+                continue
+            mark = " "
+            if total > 1:
+                if index == laps.fastest:
+                    mark = "▲"
+                elif index == laps.slowest:
+                    mark = "▼"
+            self.update_widget(row, text=(
+                f"{index + 1:>7} {mark} {format_duration(laps.lap(index), 3)}"
+                f"  {format_duration(laps.split(index), 3)}"
+            ))
+
+        bottom = max(top - self.LAP_ROWS + 1, 0)
+        self.update_widget(self.lap_status,
+                           text=f"{top + 1}–{bottom + 1} из {total}")
+
+    def export_laps(self):
+        if not len(self.laps):
+            return
+        path = filedialog.asksaveasfilename(
+            parent=self, defaultextension=".csv",
+            filetypes=[("CSV", "*.csv"), ("Двоичный", "*.laps")]
+        )
+        if not path:
+            return
+        try:
+            self.start_export(path)
+        except (OSError, RuntimeError) as exc:
+            self.update_widget(self.lap_status, text=f"Ошибка: {exc}")
+
+    def start_export(self, path):
+        """Экспорт кругов кусками между кадрами; сколько кругов пишется.
+
+        Бросает OSError, если файл не открыть, и RuntimeError, если
+        предыдущий экспорт ещё идёт."""
+        if self._export is not None:
+            raise RuntimeError("экспорт кругов уже идёт")
+        f = open_export(path)
+        self._export = (f, self.laps.export_steps(f, path))
+        self._export_step()
+        return len(self.laps)
+
+    def _export_step(self):
+        self._export_job = None
+        f, steps = self._export
+        try:
+            written = next(steps, None)
+        except OSError as exc:
+            self._finish_export(f"Ошибка: {exc}")
+            return
+        if written is None:
+            self._finish_export("Круги сохранены")
+            return
+        self.update_widget(self.lap_status, text=f"Сохранение… {written}")
+        # Между кусками Tk успевает отрисовать кадр и обработать ввод
+        self._export_job = self.after(1, self._export_step)
+
+    def _finish_export(self, text):
+        f, _ = self._export
+        self._export = None
+        try:
+            f.close()
+        except OSError as exc:
+            text = f"Ошибка: {exc}"
+        self.update_widget(self.lap_status, text=text)
+
+    def close(self):
+        # Недописанный экспорт обрывается, но файл закрывается
+        if self._export_job is not None:
+            self.after_cancel(self._export_job)
+            self._export_job = None
+        if self._export is not None:
+            self._export[0].close()
+            self._export = None
+
+    def refresh_interval(self):
+        # На паузе показывать нечего — карточка не будится вовсе
+        if not self.running:
+            return None
+        return DISPLAY_INTERVAL if self.digits else 0.1
+
     def tick(self, now_dt, now_ts):
-        if self.running:
-            if self.last_ts is None:
-                self.last_ts = now_ts
-            dt = now_ts - self.last_ts
-            self.last_ts = now_ts
-            self.elapsed += dt
         self._update_label()
 
 
@@ -292,24 +708,30 @@ class StopwatchCard(BaseCard):
 # ---------------------------------------------------------
 
 class TimerCard(BaseCard):
+    # Отсчёт должен закончиться вовремя, даже если карточка скрыта
+    tick_when_hidden = True
+
     def __init__(self, parent, app):
         super().__init__(parent, app, "C", "Таймер обратного отсчёта (C)")
 
-        self.display_font = tkfont.Font(family="Consolas", size=28, weight="bold")
-        self.small_font = tkfont.Font(family="Arial", size=11)
+        self.display_font = font_cache.get("Consolas", 28, "bold", self)
+        self.small_font = font_cache.get("Arial", 11, "normal", self)
 
-        self.label = tk.Label(
-            self.body, text="00:00:00",
-            font=self.display_font, bg="#222222", fg="#ffffff"
+        # Цвет цифр задаёт _update_label (на последней секунде — warning)
+        self.label = self.paint(
+            tk.Label(self.body, text="00:00:00", font=self.display_font),
+            bg="window"
         )
+        self.update_widget(self.label, fg=self.theme.text)
         self.label.pack(pady=(10, 5), expand=True)
 
-        entry_frame = tk.Frame(self.body, bg="#222222")
+        entry_frame = self.paint(tk.Frame(self.body), bg="window")
         entry_frame.pack(pady=(0, 5))
 
-        self.entry_label = tk.Label(
-            entry_frame, text="Установить (ч:м:с):",
-            font=self.small_font, bg="#222222", fg="#dddddd"
+        self.entry_label = self.paint(
+            tk.Label(entry_frame, text="Установить (ч:м:с):",
+                     font=self.small_font),
+            bg="window", fg="text_dim"
         )
         self.entry_label.pack(side="left", padx=4)
 
@@ -326,7 +748,7 @@ class TimerCard(BaseCard):
         )
         self.set_btn.pack(side="left", padx=4)
 
-        btn_frame = tk.Frame(self.body, bg="#222222")
+        btn_frame = self.paint(tk.Frame(self.body), bg="window")
         btn_frame.pack(pady=(0, 10))
 
         self.start_btn = tk.Button(
@@ -341,101 +763,364 @@ class TimerCard(BaseCard):
         )
         self.reset_btn.pack(side="left", padx=5)
 
-        self.remaining = 0.0  # секунд
-        self.running = False
-        self.last_ts = None
+        # Оставшееся = длительность − прошедшее по монотонной шкале
+        self.countdown = Countdown()
+        self.digits = 0
+        self.label.bind("<Button-1>", self.cycle_digits)
+
+        self.body_size = (0, 0)
+        self.body.bind("<Configure>", self.on_resize)
 
-        self.bind("<Configure>", self.on_resize)
+    @property
+    def running(self):
+        return self.countdown.running
 
     def on_resize(self, event):
-        size = min(event.width // 7, event.height // 3)
-        self.display_font.configure(size=max(size, 10))
-        small = max(int(size * 0.5), 8)
-        self.small_font.configure(size=small)
+        self.body_size = (event.width, event.height)
+        self._fit_fonts()
+
+    def _fit_fonts(self):
+        w, h = self.body_size
+        if not w:
+            return
+        # Под цифры — меньше половины высоты: ниже ещё поле ввода и кнопки
+        size = font_cache.fit(
+            "Consolas", "bold", format_duration(0, self.digits),
+            w - 16, h * 0.45, self
+        )
+        size = max(size, 10)
+        self.display_font = font_cache.get("Consolas", size, "bold", self)
+        self.small_font = font_cache.get(
+            "Arial", max(snap(size * 0.5), 8), "normal", self
+        )
+        self.update_widget(self.label, font=self.display_font)
+        for widget in (self.entry_label, self.entry, self.set_btn,
+                       self.start_btn, self.reset_btn):
+            self.update_widget(widget, font=self.small_font)
 
     def _update_label(self):
-        total = max(int(self.remaining), 0)
-        h = total // 3600
-        m = (total % 3600) // 60
-        s = total % 60
-        self.label.config(text=f"{h:02d}:{m:02d}:{s:02d}")
-        self.label.config(fg="#ff5555" if total == 0 else "#ffffff")
+        remaining = self.countdown.remaining_ns()
+        self.update_widget(
+            self.label,
+            text=format_duration(remaining, self.digits),
+            fg=(self.theme.warning if remaining < NS_PER_SEC
+                else self.theme.text)
+        )
+
+    def apply_theme(self, theme):
+        fg = self._widget_state[self.label]["fg"]
+        warning = fg == self.theme.warning
+        super().apply_theme(theme)
+        self.update_widget(
+            self.label, fg=theme.warning if warning else theme.text
+        )
+
+    def cycle_digits(self, event=None):
+        self.digits = {0: 2, 2: 3, 3: 0}[self.digits]
+        self._fit_fonts()
+        self._update_label()
+        self.app.wake()
 
     def apply_entry(self):
         text = self.entry.get().strip()
         if not text:
             return
-        try:
-            parts = text.split(":")
-            if len(parts) == 3:
-                h, m, s = parts
-            elif len(parts) == 2:
-                h = "0"
-                m, s = parts
-            elif len(parts) == 1:
-                h, m, s = "0", "0", parts[0]
-            else:
-                raise ValueError
-            h = max(int(h), 0)
-            m = max(int(m), 0)
-            s = max(int(s), 0)
-        except ValueError:
+        hms = parse_hms(text)
+        if hms is None:
             # Если формат неверный — просто игнорируем
             return
 
-        total = h * 3600 + m * 60 + s
-        self.remaining = float(total)
-        self.running = False
-        self.last_ts = None
+        h, m, s = hms
+        self.set_seconds(h * 3600 + m * 60 + s)
+
+    def set_seconds(self, seconds):
+        """Новая длительность отсчёта (отсчёт останавливается)."""
+        self.countdown.set(round(seconds * NS_PER_SEC))
         self.start_btn.config(text="Старт")
         self._update_label()
 
     def toggle_start(self):
         if not self.running:
-            if self.remaining <= 0:
+            if self.countdown.remaining_ns() <= 0:
                 self.apply_entry()
-                if self.remaining <= 0:
+                if self.countdown.remaining_ns() <= 0:
                     return
-            self.running = True
-            self.last_ts = time.time()
+            self.countdown.start()
             self.start_btn.config(text="Пауза")
+            self.app.wake()
         else:
-            self.running = False
-            self.last_ts = None
+            self.countdown.pause()
             self.start_btn.config(text="Старт")
+            self._update_label()
 
     def reset(self):
-        self.running = False
-        self.last_ts = None
-        self.remaining = 0.0
+        self.countdown.set(0)
         self.start_btn.config(text="Старт")
         self._update_label()
 
+    def refresh_interval(self):
+        if not self.running:
+            return None
+        return DISPLAY_INTERVAL if self.digits else 0.1
+
+    def next_event(self):
+        deadline = self.countdown.deadline_ns()
+        if deadline is None:
+            return None
+        return (deadline - now_ns()) / NS_PER_SEC
+
     def tick(self, now_dt, now_ts):
-        if self.running and self.remaining > 0:
-            if self.last_ts is None:
-                self.last_ts = now_ts
-            dt = now_ts - self.last_ts
-            self.last_ts = now_ts
-            self.remaining -= dt
-            if self.remaining <= 0:
-                self.remaining = 0
-                self.running = False
-                self.start_btn.config(text="Старт")
+        if self.running and self.countdown.remaining_ns() == 0:
+            self.countdown.pause()
+            self.start_btn.config(text="Старт")
         self._update_label()
 
 
+# ---------------------------------------------------------
+# Много таймеров и будильников
+# ---------------------------------------------------------
+
+class TimersCard(BaseCard):
+    """Список ближайших срабатываний из ``app.alarms``.
+
+    Строк на экране всегда ROWS, сколько бы записей ни было: колесо мыши
+    сдвигает окно по списку, а в строки пишется только видимое.
+    Срабатывания отслеживает само приложение — и когда карточка скрыта.
+    """
+
+    ROWS = 8
+
+    def __init__(self, parent, app):
+        super().__init__(parent, app, "T", "Таймеры и будильники (T)")
+        self.alarms = app.alarms
+        self.offset = 0
+        self.last_fired = ""
+        # Номера для безымянных записей только растут: «#3» не займёт
+        # имя живой записи, даже когда записей стало меньше
+        self._auto_names = itertools.count(1)
+
+        self.font = font_cache.get("Consolas", 11, "normal", self)
+        self.small_font = font_cache.get("Arial", 10, "normal", self)
+
+        # Форма: имя, время (длительность или время суток), повтор
+        form = self.paint(tk.Frame(self.body), bg="window")
+        form.pack(fill="x", padx=4, pady=(4, 2))
+
+        self.name_entry = tk.Entry(form, width=12, font=self.small_font)
+        self.name_entry.pack(side="left", padx=2)
+        self.time_entry = tk.Entry(
+            form, width=9, font=self.small_font, justify="center"
+        )
+        self.time_entry.insert(0, "00:05:00")
+        self.time_entry.pack(side="left", padx=2)
+
+        self.repeat = tk.BooleanVar(value=False)
+        self.paint(
+            tk.Checkbutton(form, text="повтор", variable=self.repeat,
+                           font=self.small_font),
+            bg="window", fg="text_dim", selectcolor="window",
+            activebackground="window"
+        ).pack(side="left", padx=2)
+
+        tk.Button(
+            form, text="Таймер", font=self.small_font,
+            command=self.add_timer
+        ).pack(side="left", padx=2)
+        tk.Button(
+            form, text="Будильник", font=self.small_font,
+            command=self.add_alarm
+        ).pack(side="left", padx=2)
+
+        # Строки списка (двойной щелчок — удалить запись)
+        self.rows = []
+        self._row_names = [None] * self.ROWS
+        for i in range(self.ROWS):
+            row = self.paint(
+                tk.Label(self.body, text="", font=self.font, anchor="w"),
+                bg="window", fg="text"
+            )
+            row.pack(fill="x", padx=6)
+            row.bind("<Double-Button-1>", lambda e, i=i: self.cancel_row(i))
+            self.rows.append(row)
+
+        self.status = self.paint(
+            tk.Label(self.body, text="", font=self.small_font, anchor="w"),
+            bg="window", fg="text_dim"
+        )
+        self.status.pack(fill="x", padx=6, pady=(2, 4))
+
+        for widget in [self.body, self.status] + self.rows:
+            widget.bind("<MouseWheel>", self.on_wheel)
+            widget.bind("<Button-4>", lambda e: self.scroll(-1))
+            widget.bind("<Button-5>", lambda e: self.scroll(1))
+
+    def _read_form(self):
+        hms = parse_hms(self.time_entry.get())
+        if hms is None:
+            return None, None
+        name = self.name_entry.get().strip() or self._auto_name()
+        return name, hms
+
+    def _auto_name(self):
+        while True:
+            name = f"#{next(self._auto_names)}"
+            if name not in self.alarms.entries:
+                return name
+
+    def add_timer(self):
+        name, hms = self._read_form()
+        if hms is None:
+            return
+        h, m, s = hms
+        total = h * 3600 + m * 60 + s
+        if total <= 0:
+            return
+        self.alarms.add_timer(name, total * NS_PER_SEC,
+                              repeat=self.repeat.get())
+        self.refresh()
+
+    def add_alarm(self):
+        name, hms = self._read_form()
+        if hms is None:
+            return
+        h, m, s = hms
+        if h > 23 or m > 59 or s > 59:
+            return
+        self.alarms.add_alarm(name, hms, repeat=self.repeat.get())
+        self.refresh()
+
+    def cancel_row(self, i):
+        name = self._row_names[i]
+        if name is not None and self.alarms.cancel(name):
+            self.refresh()
+
+    def on_wheel(self, event):
+        self.scroll(-1 if event.delta > 0 else 1)
+
+    def scroll(self, rows):
+        self.offset = max(self.offset + rows, 0)
+        self._update_rows()
+
+    def refresh(self):
+        """Список изменился: перерисовать и пересчитать пробуждение."""
+        self._update_rows()
+        self.app.wake()
+
+    def notify(self, fired):
+        names = ", ".join(entry.name for entry in fired[:3])
+        if len(fired) > 3:
+            names += f" и ещё {len(fired) - 3}"
+        self.last_fired = f"Сработало: {names}"
+        self._update_rows()
+
+    def _update_rows(self):
+        total = len(self.alarms)
+        self.offset = min(self.offset, max(total - self.ROWS, 0))
+        items = self.alarms.upcoming(self.offset + self.ROWS)[self.offset:]
+
+        for i, row in enumerate(self.rows):
+            if i < len(items):
+                left, entry = items[i]
+                if entry.kind == ALARM:
+                    when = "в {:02d}:{:02d}:{:02d}".format(*entry.hms)
+                else:
+                    when = format_duration(int(max(left, 0) * NS_PER_SEC))
+                mark = "↻" if entry.repeat else " "
+                text = f"{when:>11} {mark} {entry.name}"
+                self._row_names[i] = entry.name
+            else:
+                text = ""
+                self._row_names[i] = None
+            self.update_widget(row, text=text)
+
+        shown = (f"{self.offset + 1}–{self.offset + len(items)} из {total}"
+                 if items else "нет записей")
+        if self.last_fired:
+            shown += f"  ·  {self.last_fired}"
+        self.update_widget(self.status, text=shown)
+
+    def refresh_interval(self):
+        # Обратный отсчёт в строках идёт раз в секунду; пусто — не будим
+        return 1.0 if len(self.alarms) else None
+
+    def tick(self, now_dt, now_ts):
+        self._update_rows()
+
+
+# ---------------------------------------------------------
+# Замеры производительности (оверлей)
+# ---------------------------------------------------------
+
+class MetricsCard(BaseCard):
+    def __init__(self, parent, app):
+        super().__init__(parent, app, "M", "Замеры, мс (M)")
+
+        self.font = font_cache.get("Consolas", 9, "normal", self)
+        self.label = self.paint(
+            tk.Label(self.body, text="", font=self.font, justify="left",
+                     anchor="nw"),
+            bg="window", fg="metrics"
+        )
+        self.label.pack(fill="both", expand=True, padx=4, pady=4)
+
+    def refresh_interval(self):
+        return 0.5
+
+    def tick(self, now_dt, now_ts):
+        lines = [f"{'':<22}{'p50':>7}{'p95':>7}{'p99':>7}{'max':>7}"]
+        for name, st in self.app.metrics.snapshot().items():
+            lines.append(
+                f"{name:<22}{st['p50']:7.2f}{st['p95']:7.2f}"
+                f"{st['p99']:7.2f}{st['max']:7.2f}"
+            )
+        frame = self.app.frame
+        lines.append(f"Tcl: команд {frame.commands}, пакетов {frame.commits}, "
+                     f"сэкономлено {frame.saved}")
+        self.update_widget(self.label, text="\n".join(lines))
+
+
 # ---------------------------------------------------------
 # Главное приложение
 # ---------------------------------------------------------
 
 class ClockApp:
-    MIN_SIZE = 600  # минимальный размер окна (квадрат)
+    """Одно окно с карточками. Окон может быть несколько (например, по
+    одному на монитор): их ведёт общий ``ClockLoop``."""
 
-    def __init__(self, root):
+    MIN_SIZE = 600  # минимальный размер окна (квадрат)
+    IDLE_PERIOD = 1.0  # сек, если ни одной карточке не нужно чаще
+    BACKGROUND_PERIOD = 60.0  # сек, пока окно свёрнуто или закрыто
+
+    # Карточки создаются при первом показе, а не все сразу при старте
+    CARD_TYPES = {
+        "A": AnalogClockCard,
+        "D": DigitalClockCard,
+        "S": StopwatchCard,
+        "C": TimerCard,
+        "T": TimersCard,
+        "W": WorldClockCard,
+        "M": MetricsCard,
+    }
+
+    def __init__(self, root, metrics_dump=None, startup=None,
+                 theme=DEFAULT_THEME, sweep=False, low_power=LOW_POWER,
+                 timers_file=None, world_zones=None, loop=None):
         self.root = root
+        # Первое окно заводит общий цикл, остальные к нему подключаются
+        if loop is None:
+            loop = ClockLoop(root, metrics_dump=metrics_dump,
+                             timers_file=timers_file)
+        self.loop = loop
+        loop.windows.append(self)
+        # Изменения виджетов за кадр уходят в Tcl одним вызовом
+        self.frame = loop.frame
+        # В режиме экономии секундная стрелка только шагает
+        self.sweep = sweep and not low_power
+        self.startup = startup if startup is not None else StartupTimer()
+        self.theme = theme
+        self.themed = ThemedWidgets()
         self.root.title("Clock Suite")
-        self.root.configure(bg="#222222")
+        self.themed.add(self.root, bg="window")
         self.root.geometry(f"{self.MIN_SIZE}x{self.MIN_SIZE}")
         self.root.minsize(self.MIN_SIZE, self.MIN_SIZE)
 
@@ -443,63 +1128,151 @@ class ClockApp:
         self.two_columns = False
         self.dragging_key = None
 
+        # Что сейчас реально стоит в сетке: {ключ: (строка, столбец)}
+        self.placed = {}
+        self.weighted_rows = 0
+        self.columns_applied = False
+        self._layout_job = None
+
+        # Перетаскивание: индекс мест вставки (сбрасывается при раскладке)
+        self.slot_index = None
+        self.drag_slots = None
+        self.drag_target = None
+
+        # Замеры, таймеры и будильники — общие для всех окон
+        self.metrics = loop.metrics
+        self.alarms = loop.alarms
+
+        # Часовые пояса стены мировых часов (карточка W)
+        self.world_zones = check_zones(world_zones or parse_zones(None))
+
         # Панель кнопок
-        self.control_frame = tk.Frame(self.root, bg="#333333")
+        self.control_frame = self.themed.add(
+            tk.Frame(self.root), bg="panel"
+        )
         self.control_frame.pack(side="top", fill="x")
 
-        self.main_frame = tk.Frame(self.root, bg="#222222")
+        self.main_frame = self.themed.add(tk.Frame(self.root), bg="window")
         self.main_frame.pack(side="top", fill="both", expand=True)
 
         self.main_frame.grid_columnconfigure(0, weight=1, uniform="col")
         self.main_frame.grid_columnconfigure(1, weight=0, uniform="col")
 
+        # Координаты карточек меняются при любом ресайзе области
+        self.main_frame.bind("<Configure>", self.invalidate_slots)
+
+        # Линия-призрак: куда встанет перетаскиваемая карточка
+        self.ghost = self.themed.add(tk.Frame(self.main_frame), bg="accent")
+
         self.buttons = {}
         self.cards = {}
         self.layout = {}
 
-        # Создаём карточки
-        self.cards["A"] = AnalogClockCard(self.main_frame, self)
-        self.cards["D"] = DigitalClockCard(self.main_frame, self)
-        self.cards["S"] = StopwatchCard(self.main_frame, self)
-        self.cards["C"] = TimerCard(self.main_frame, self)
+        # Когда каждой карточке следующий tick (настенное время, сек)
+        self.next_due = {}
 
-        # Начальная раскладка: все 4 видимы в одном столбце
+        # Начальная раскладка: все 4 видимы в одном столбце,
+        # список таймеров и оверлей замеров скрыты
         order = 0
         for key in ["A", "D", "S", "C"]:
             self.layout[key] = {"visible": True, "col": 0, "order": order}
             order += 1
+        for key in ["T", "W", "M"]:
+            self.layout[key] = {"visible": False, "col": 0, "order": order}
+            order += 1
 
-        # Кнопки A/D/S/C
-        for key, text in [("A", "A"), ("D", "D"), ("S", "S"), ("C", "C")]:
-            btn = tk.Button(
+        # Кнопки A/D/S/C/T/W/M
+        for key in ["A", "D", "S", "C", "T", "W", "M"]:
+            btn = self.themed.add(tk.Button(
                 self.control_frame,
-                text=text,
+                text=key,
                 width=3,
                 command=lambda k=key: self.toggle_element(k),
-                bg="#555555", fg="#ffffff", relief="sunken"
-            )
+            ), fg="text")
             btn.pack(side="left", padx=3, pady=3)
             self.buttons[key] = btn
+            self.style_button(key)
 
         # Кнопка столбца
-        self.columns_btn = tk.Button(
+        self.columns_btn = self.themed.add(tk.Button(
             self.control_frame,
             text="►",
             width=3,
             command=self.toggle_columns,
-            bg="#444444", fg="#ffffff"
-        )
+        ), bg="header", fg="text")
         self.columns_btn.pack(side="right", padx=5, pady=3)
 
+        # Ещё одно окно в том же процессе (например, на второй монитор)
+        self.window_btn = self.themed.add(tk.Button(
+            self.control_frame,
+            text="+",
+            width=3,
+            command=self.open_window,
+        ), bg="header", fg="text")
+        self.window_btn.pack(side="right", padx=5, pady=3)
+
+        # Кнопка темы (день / ночь)
+        self.theme_btn = self.themed.add(tk.Button(
+            self.control_frame,
+            text="☾",
+            width=3,
+            command=lambda: self.set_theme(next_theme(self.theme)),
+        ), bg="header", fg="text")
+        self.theme_btn.pack(side="right", padx=5, pady=3)
+
+        self.themed.apply(self.theme, self._configure)
+
         # Следим за изменением размера окна (чтобы оставалось квадратным)
         self.root.bind("<Configure>", self.on_root_configure)
 
-        # Событие окончания перетаскивания (отпускание кнопки мыши)
+        # Свёрнутое или закрытое окно: тикают только события (конец
+        # отсчёта), а вернувшись на экран, всё обновляется сразу
+        self.visibility = WindowVisibility(
+            self.root, lambda hidden: self.wake()
+        )
+
+        # Перетаскивание: движение с зажатой кнопкой и отпускание
+        self.root.bind("<B1-Motion>", self.on_mouse_motion)
         self.root.bind("<ButtonRelease-1>", self.on_mouse_release)
 
-        # Первая раскладка + подгонка окна
+        # Первая раскладка + подгонка окна (карточки появятся по одной)
         self.relayout()
 
+    # ---------- тема ----------
+
+    @staticmethod
+    def _configure(widget, **options):
+        widget.config(**options)
+
+    def style_button(self, key):
+        visible = self.layout[key]["visible"]
+        self.buttons[key].config(
+            bg=self.theme.button_on if visible else self.theme.button_off,
+            relief="sunken" if visible else "raised"
+        )
+
+    def set_theme(self, theme):
+        """Перекрашивает всё на лету; виджеты и элементы не пересоздаются.
+        Ещё не созданные карточки сразу получат новую тему."""
+        if theme is self.theme:
+            return
+        self.theme = theme
+        self.themed.apply(theme, self._configure)
+        for key in self.buttons:
+            self.style_button(key)
+        for card in self.cards.values():
+            card.apply_theme(theme)
+
+    # ---------- ленивое создание карточек ----------
+
+    def build_card(self, key):
+        t0 = time.perf_counter()
+        card = self.CARD_TYPES[key](self.main_frame, self)
+        self.cards[key] = card
+        self.next_due[key] = 0.0
+        self.startup.add("card_build", time.perf_counter() - t0)
+        return card
+
     # ---------- управление раскладкой и окном ----------
 
     def on_root_configure(self, event):
@@ -519,62 +1292,92 @@ class ClockApp:
         self.auto_resizing = False
 
     def autosize_window(self):
+        with self.metrics.timer("autosize_window"):
+            self._autosize_window()
+
+    def _autosize_window(self):
         self.root.update_idletasks()
         w = self.root.winfo_reqwidth()
         h = self.root.winfo_reqheight()
         size = max(w, h, self.MIN_SIZE)
 
+        # Окно уже нужного размера — не запускаем каскад ресайзов
+        if (self.root.winfo_width() == size and
+                self.root.winfo_height() == size):
+            return
+
         self.auto_resizing = True
         self.root.geometry(f"{size}x{size}")
         self.auto_resizing = False
 
     def get_visible_in_column(self, col):
-        items = [
-            k for k, meta in self.layout.items()
-            if meta["visible"] and meta["col"] == col
-        ]
-        items.sort(key=lambda k: self.layout[k]["order"])
-        return items
+        return column_keys(self.layout, col)
 
     def relayout(self):
-        # Убираем все карточки
-        for card in self.cards.values():
-            card.grid_forget()
-
-        col_rows = {0: 0, 1: 0}
-
-        # Колонки 0 и 1
-        for col in [0, 1]:
-            items = self.get_visible_in_column(col)
-            for key in items:
-                card = self.cards[key]
-                card.grid(
-                    row=col_rows[col], column=col,
-                    sticky="nsew", padx=6, pady=6
-                )
-                col_rows[col] += 1
-
-        max_rows = max(col_rows.values())
-        for r in range(max_rows):
+        """Запланировать раскладку. Все изменения, сделанные до ближайшего
+        простоя, применяются одним проходом."""
+        if self._layout_job is None:
+            self._layout_job = self.root.after_idle(self._apply_layout)
+
+    def _apply_layout(self):
+        self._layout_job = None
+        with self.metrics.timer("relayout"):
+            pending = self._relayout()
+        self.autosize_window()
+        self.invalidate_slots()
+
+        if pending:
+            # Остальные карточки — следующими проходами, после отрисовки
+            self.relayout()
+        elif "ready" not in self.startup.phases:
+            self.startup.at("ready")
+        if "first_paint" not in self.startup.phases:
+            self.root.after_idle(lambda: self.startup.at("first_paint"))
+
+    def _relayout(self):
+        """Возвращает True, если ещё остались не созданные карточки."""
+        # Видимые, но ещё не созданные карточки: за проход создаём одну,
+        # чтобы первый кадр появился, не дожидаясь всех остальных
+        target = grid_positions(self.layout)
+        missing = [key for key in target if key not in self.cards]
+        if missing:
+            self.build_card(missing[0])
+        target = {
+            key: pos for key, pos in target.items() if key in self.cards
+        }
+
+        # Двигаем только карточки, чья позиция в сетке изменилась
+        remove, place = diff_positions(self.placed, target)
+        for key in remove:
+            self.cards[key].grid_forget()
+        for key, (row, col) in place.items():
+            self.cards[key].grid(
+                row=row, column=col,
+                sticky="nsew", padx=6, pady=6
+            )
+        self.placed = target
+
+        rows = row_count(target)
+        for r in range(self.weighted_rows, rows):
             self.main_frame.grid_rowconfigure(r, weight=1)
+        self.weighted_rows = max(self.weighted_rows, rows)
 
-        # Настройка ширины колонок
-        if self.two_columns:
-            self.main_frame.grid_columnconfigure(0, weight=1, uniform="col")
-            self.main_frame.grid_columnconfigure(1, weight=1, uniform="col")
-        else:
-            self.main_frame.grid_columnconfigure(0, weight=1, uniform="col")
-            self.main_frame.grid_columnconfigure(1, weight=0, uniform="col")
+        # Настройка ширины колонок — только если режим сменился
+        if self.two_columns != self.columns_applied:
+            weight = 1 if self.two_columns else 0
+            self.main_frame.grid_columnconfigure(
+                1, weight=weight, uniform="col"
+            )
+            self.columns_applied = self.two_columns
 
-        self.autosize_window()
+        return len(missing) > 1
 
     def toggle_element(self, key):
         meta = self.layout[key]
         meta["visible"] = not meta["visible"]
 
-        btn = self.buttons[key]
+        self.style_button(key)
         if meta["visible"]:
-            btn.config(relief="sunken", bg="#555555")
             # новый элемент ставим в конец своего столбца
             col = 0
             meta["col"] = col
@@ -583,10 +1386,12 @@ class ClockApp:
                 [self.layout[k]["order"] for k in existing],
                 default=-1
             ) + 1)
-        else:
-            btn.config(relief="raised", bg="#222222")
+
+        if key == "M":
+            self.loop.update_metrics()
 
         self.relayout()
+        self.wake()
 
     def toggle_columns(self):
         self.two_columns = not self.two_columns
@@ -611,66 +1416,79 @@ class ClockApp:
 
     def start_drag(self, key):
         self.dragging_key = key
+        if self.slot_index is None:
+            self.slot_index = self._build_slot_index()
+        self.drag_slots = self.slot_index.for_drag(key)
+        self.drag_target = None
+
+    def _build_slot_index(self):
+        """Рамки видимых карточек относительно main_frame — один раз на
+        раскладку, а не на каждое движение мыши."""
+        boxes = {0: [], 1: []}
+        for key, (row, col) in self.placed.items():
+            card = self.cards[key]
+            top = card.winfo_y()
+            boxes[col].append((key, top, top + card.winfo_height()))
+        return SlotIndex(boxes)
+
+    def invalidate_slots(self, event=None):
+        self.slot_index = None
+
+    def _drop_target(self, x_root, y_root):
+        """(столбец, место вставки) под курсором или None — вне области."""
+        main = self.main_frame
+        x = x_root - main.winfo_rootx()
+        y = y_root - main.winfo_rooty()
+        w = main.winfo_width()
+        h = main.winfo_height()
 
-    def on_mouse_release(self, event):
-        if not self.dragging_key:
-            return
+        # Если курсор вне основной области — не двигаем
+        if not (0 <= x <= w and 0 <= y <= h):
+            return None
 
-        key = self.dragging_key
-        self.dragging_key = None
+        # Определяем колонку
+        col = 1 if self.two_columns and x > w / 2 else 0
+        return col, self.drag_slots.insert_index(col, y)
 
-        main = self.main_frame
-        main_x = main.winfo_rootx()
-        main_y = main.winfo_rooty()
-        main_w = main.winfo_width()
-        main_h = main.winfo_height()
+    def on_mouse_motion(self, event):
+        if not self.dragging_key:
+            return
 
-        x_root = event.x_root
-        y_root = event.y_root
+        target = self._drop_target(event.x_root, event.y_root)
+        if target == self.drag_target:
+            return
+        self.drag_target = target
 
-        # Если отпустили вне основной области — не двигаем
-        if not (main_x <= x_root <= main_x + main_w and
-                main_y <= y_root <= main_y + main_h):
+        if target is None:
+            self.ghost.place_forget()
             return
 
-        # Определяем колонку
-        if self.two_columns and x_root > main_x + main_w / 2:
-            target_col = 1
+        # Линия-призрак там, куда встанет карточка
+        col, index = target
+        w = self.main_frame.winfo_width()
+        if self.two_columns:
+            x, width = (w / 2 if col else 0), w / 2
         else:
-            target_col = 0
+            x, width = 0, w
+        y = self.drag_slots.marker_y(col, index)
+        self.ghost.place(x=x + 6, y=y - 2, width=width - 12, height=4)
+        self.ghost.lift()
 
-        # Список видимых в этой колонке, кроме перетаскиваемого
-        col_items = self.get_visible_in_column(target_col)
-        col_items = [k for k in col_items if k != key]
-
-        if not col_items:
-            # единственный элемент в колонке
-            self.layout[key]["col"] = target_col
-            self.layout[key]["order"] = 0
-            self.relayout()
+    def on_mouse_release(self, event):
+        if not self.dragging_key:
             return
 
-        # Центры карточек в этой колонке
-        centers = []
-        for k in col_items:
-            w = self.cards[k]
-            cy = w.winfo_rooty() + w.winfo_height() / 2
-            centers.append((k, cy))
-
-        y = y_root
-        # Определяем позицию вставки
-        if y < centers[0][1]:
-            insert_idx = 0
-        elif y > centers[-1][1]:
-            insert_idx = len(centers)
-        else:
-            insert_idx = len(centers)
-            for i in range(len(centers) - 1):
-                if centers[i][1] <= y < centers[i + 1][1]:
-                    insert_idx = i + 1
-                    break
+        key = self.dragging_key
+        self.dragging_key = None
+        self.ghost.place_forget()
+
+        target = self._drop_target(event.x_root, event.y_root)
+        if target is None:
+            return
+        target_col, insert_idx = target
 
-        new_list = [k for (k, _) in centers]
+        # Видимые в этой колонке, кроме перетаскиваемого
+        new_list = list(self.drag_slots.keys(target_col))
         new_list.insert(insert_idx, key)
 
         for idx, k in enumerate(new_list):
@@ -679,18 +1497,435 @@ class ClockApp:
 
         self.relayout()
 
+    # ---------- окна ----------
+
+    def open_window(self):
+        """Новое окно с теми же настройками; цикл и кэши — общие."""
+        return self.loop.open_window(theme=self.theme, sweep=self.sweep,
+                                     world_zones=self.world_zones)
+
+    def close(self):
+        if self._layout_job is not None:
+            self.root.after_cancel(self._layout_job)
+            self._layout_job = None
+        for card in self.cards.values():
+            card.close()
+
     # ---------- обновление всех элементов ----------
 
     def update_all(self):
-        now_dt = datetime.datetime.now()
-        now_ts = time.time()
-        for card in self.cards.values():
-            card.tick(now_dt, now_ts)
-        self.root.after(100, self.update_all)
+        """Один кадр общего цикла (всех окон процесса)."""
+        self.loop.update_all()
+
+    def update_cards(self, now_dt, now_ts):
+        """Будим только те карточки, которым пора и которые видны.
+
+        Возвращает (период цикла, через сколько секунд разбудить или None).
+        """
+        hidden = self.visibility.hidden
+        period = self.BACKGROUND_PERIOD if hidden else self.IDLE_PERIOD
+        wake = None
+        metrics = self.metrics
+
+        for key, card in self.cards.items():
+            if hidden or not self.layout[key]["visible"]:
+                # Невидимой карточке перерисовывать нечего: будим её
+                # только к её событию (концу отсчёта), ровно в срок
+                if not card.tick_when_hidden:
+                    continue
+                event = card.next_event()
+                if event is None:
+                    continue
+                if event > 0:
+                    wake = event if wake is None else min(wake, event)
+                    continue
+            else:
+                refresh = card.refresh_interval()
+                if refresh is None:
+                    continue
+                period = min(period, refresh)
+                if now_ts < self.next_due[key]:
+                    continue
+                self.next_due[key] = (now_ts // refresh + 1) * refresh
+
+            with metrics.timer(f"tick.{key}"):
+                card.tick(now_dt, now_ts)
+        return period, wake
+
+    def wake(self):
+        """Карточка сменила режим (старт, показ) — тикнуть немедленно."""
+        self.loop.wake()
 
     def start(self):
-        self.update_all()
+        self.loop.start()
+
+
+# ---------------------------------------------------------
+# Общий цикл для всех окон
+# ---------------------------------------------------------
+
+class ClockLoop:
+    """Один планировщик на процесс, сколько бы ни было окон.
+
+    Время берётся один раз за кадр и раздаётся всем карточкам всех окон;
+    таймеры и будильники, замеры, пакет Tcl-команд, кэши циферблатов,
+    шрифтов и атласов стрелок — общие. Каждое следующее окно — это
+    ``Toplevel`` в том же интерпретаторе Tk, а не новый процесс.
+    """
+
+    DUMP_PERIOD_MS = 10_000  # как часто сбрасывать замеры в файл
+
+    def __init__(self, root, metrics_dump=None, timers_file=None):
+        self.root = root
+        self.windows = []
+        self.ticker = None
+        self.control = None
+        # Время последнего кадра: по нему раскладываются и новые элементы
+        self.now_ts = time.time()
+        self.frame = frame_batch(root)
+
+        # Замеры включаются, когда виден оверлей M или задан файл для сброса
+        self.metrics_dump = metrics_dump
+        self.metrics = Metrics(enabled=bool(metrics_dump))
+
+        # Таймеры и будильники: срабатывают и при скрытой карточке T
+        self.alarms = AlarmQueue()
+        if timers_file:
+            load_timers(timers_file, self.alarms)
+
+    # ---------- окна ----------
+
+    def open_window(self, **options):
+        top = tk.Toplevel(self.root)
+        app = ClockApp(top, loop=self, **options)
+        top.protocol("WM_DELETE_WINDOW", lambda: self.close_window(app))
+        self.wake()
+        return app
+
+    def close_window(self, app):
+        """Закрыть дополнительное окно; главное закрывает всё сразу."""
+        if app.root is self.root:
+            self.root.destroy()
+            return
+        app.close()
+        self.windows.remove(app)
+        app.root.destroy()
+        self.update_metrics()
+
+    def update_metrics(self):
+        self.metrics.enabled = bool(self.metrics_dump) or any(
+            app.layout["M"]["visible"] for app in self.windows
+        )
+
+    # ---------- кадр ----------
+
+    def update_all(self):
+        self.now_ts = now_ts = time.time()
+        # Одно «сейчас» на кадр для всех карточек всех окон
+        now_dt = datetime.datetime.fromtimestamp(now_ts)
+        period = ClockApp.BACKGROUND_PERIOD
+        metrics = self.metrics
+        if metrics.enabled and self.ticker is not None and self.ticker.jitter:
+            metrics.record("loop.lateness", self.ticker.jitter[-1])
+
+        # Все изменения кадра (стрелки, подписи) — одним вызовом Tcl
+        with self.frame:
+            # Таймеры и будильники: смотрим только на вершину кучи и будим
+            # цикл ровно к ближайшему сроку
+            fired = self.alarms.pop_due()
+            if fired:
+                self.on_alarms(fired)
+            wake = self.alarms.next_in()
+
+            for app in self.windows:
+                app_period, app_wake = app.update_cards(now_dt, now_ts)
+                period = min(period, app_period)
+                if app_wake is not None:
+                    wake = app_wake if wake is None else min(wake, app_wake)
+
+        # Сам цикл просыпается не чаще, чем нужно самой быстрой карточке
+        if self.ticker is not None:
+            self.ticker.set_period(period * 1000)
+            if wake is not None:
+                self.ticker.wake_in(wake)
+
+    def on_alarms(self, fired):
+        self.root.bell()
+        for app in self.windows:
+            card = app.cards.get("T")
+            if card is not None:
+                card.notify(fired)
+
+    def wake(self):
+        if self.ticker is not None:
+            self.ticker.poke()
+
+    def start(self):
+        # Тики по дедлайнам, выровненные по настенному времени:
+        # смена секунды видна сразу, а не с опозданием до 100 мс
+        self.ticker = TickScheduler(
+            self.root, self.update_all, period_ms=100, align=True
+        )
+        self.ticker.start()
+        if self.metrics_dump:
+            self.root.after(self.DUMP_PERIOD_MS, self._dump_metrics)
         self.root.mainloop()
+        if self.control is not None:
+            self.control.stop()
+        if self.metrics_dump:
+            self.metrics.dump(self.metrics_dump)
+
+    def serve_control(self, address=None, export_dir=None):
+        """Включить управление извне (см. control.py). Без export_dir
+        команда stopwatch.export отключена."""
+        commands = ControlCommands(self, export_dir)
+        self.control = ControlServer(self.root, commands, address,
+                                     on_batch=commands.after_batch).start()
+        return self.control
+
+    def _dump_metrics(self):
+        self.metrics.dump(self.metrics_dump)
+        self.root.after(self.DUMP_PERIOD_MS, self._dump_metrics)
+
+
+# ---------------------------------------------------------
+# Управление извне (JSON-RPC, см. control.py)
+# ---------------------------------------------------------
+
+class ControlCommands:
+    """Команды для всех окон одного ClockLoop.
+
+    Метод «timer.set» вызывает ``timer_set``; параметры — объект
+    (по именам) или массив (по порядку). ``window`` — номер окна, 0 —
+    главное. Выполняется в потоке Tk, пачками от ControlServer.
+
+    Файлы клиент пишет только внутрь ``export_dir``: путь задаёт не
+    пользователь за экраном, а любой, кто подключился к сокету.
+    """
+
+    def __init__(self, loop, export_dir=None):
+        self.loop = loop
+        self.export_dir = (os.path.realpath(export_dir)
+                           if export_dir is not None else None)
+        self.timers_changed = False
+
+    def __call__(self, method, params):
+        name = method.replace(".", "_")
+        handler = None if name.startswith("_") else getattr(self, name, None)
+        if name == "after_batch" or not callable(handler):
+            raise ControlError(METHOD_NOT_FOUND, f"Method not found: {method}")
+        try:
+            if isinstance(params, dict):
+                inspect.signature(handler).bind(**params)
+                return handler(**params)
+            inspect.signature(handler).bind(*params)
+            return handler(*params)
+        except TypeError as exc:
+            raise ControlError(INVALID_PARAMS, str(exc)) from None
+
+    def after_batch(self):
+        """После пачки команд: список таймеров — один раз, и сразу тик."""
+        if self.timers_changed:
+            self.timers_changed = False
+            for app in self.loop.windows:
+                card = app.cards.get("T")
+                if card is not None:
+                    card.refresh()
+        self.loop.wake()
+
+    def _app(self, window):
+        if not isinstance(window, int) or \
+                not 0 <= window < len(self.loop.windows):
+            raise ControlError(INVALID_PARAMS, f"нет окна {window!r}")
+        return self.loop.windows[window]
+
+    def _card(self, key, window):
+        """Карточка окна; ещё не созданная (скрытая) создаётся."""
+        app = self._app(window)
+        card = app.cards.get(key)
+        return card if card is not None else app.build_card(key)
+
+    @staticmethod
+    def _seconds(value):
+        if not isinstance(value, (int, float)) or value < 0:
+            raise ControlError(INVALID_PARAMS,
+                               f"нужно число секунд >= 0: {value!r}")
+        return value
+
+    # ---------- общее ----------
+
+    def ping(self):
+        return "pong"
+
+    def windows(self):
+        return len(self.loop.windows)
+
+    def theme_set(self, name, window=None):
+        theme = THEMES.get(name)
+        if theme is None:
+            raise ControlError(INVALID_PARAMS, f"нет темы {name!r}")
+        apps = self.loop.windows if window is None else [self._app(window)]
+        for app in apps:
+            app.set_theme(theme)
+        return name
+
+    # ---------- карточки ----------
+
+    def cards_list(self, window=0):
+        app = self._app(window)
+        return {key: meta["visible"] for key, meta in app.layout.items()}
+
+    def cards_show(self, key, visible=True, window=0):
+        app = self._app(window)
+        if key not in app.layout:
+            raise ControlError(INVALID_PARAMS, f"нет карточки {key!r}")
+        if app.layout[key]["visible"] != bool(visible):
+            app.toggle_element(key)
+        return app.layout[key]["visible"]
+
+    # ---------- секундомер (S) ----------
+
+    @staticmethod
+    def _stopwatch_state(card):
+        return {"running": card.running,
+                "elapsed": card.span.elapsed_ns() / NS_PER_SEC,
+                "laps": len(card.laps)}
+
+    def stopwatch_get(self, window=0):
+        return self._stopwatch_state(self._card("S", window))
+
+    def stopwatch_start(self, window=0):
+        card = self._card("S", window)
+        if not card.running:
+            card.toggle_start()
+        return self._stopwatch_state(card)
+
+    def stopwatch_pause(self, window=0):
+        card = self._card("S", window)
+        if card.running:
+            card.toggle_start()
+        return self._stopwatch_state(card)
+
+    def stopwatch_reset(self, window=0):
+        card = self._card("S", window)
+        card.reset()
+        return self._stopwatch_state(card)
+
+    def stopwatch_lap(self, window=0):
+        card = self._card("S", window)
+        index = card.mark_lap()
+        if index is None:
+            raise ControlError(INVALID_PARAMS, "секундомер не запущен")
+        return {"lap": index + 1,
+                "time": card.laps.lap(index) / NS_PER_SEC,
+                "split": card.laps.split(index) / NS_PER_SEC}
+
+    def stopwatch_laps(self, start=1, count=20, window=0):
+        """Круги с номера start (с 1) — не больше count за запрос."""
+        laps = self._card("S", window).laps
+        start = max(int(start), 1) - 1
+        return [
+            {"lap": number, "time": lap / NS_PER_SEC,
+             "split": split / NS_PER_SEC}
+            for number, lap, split in laps.rows(start, start + int(count))
+        ]
+
+    def _export_path(self, path):
+        """Путь внутри export_dir; всё, что выводит наружу (.., абсолютные
+        пути, ссылки), отклоняется."""
+        if self.export_dir is None:
+            raise ControlError(INVALID_PARAMS,
+                               "экспорт выключен: часы запущены без "
+                               "--export-dir")
+        if not isinstance(path, str) or not path:
+            raise ControlError(INVALID_PARAMS, "нужно имя файла")
+        target = os.path.realpath(os.path.join(self.export_dir, path))
+        try:
+            inside = os.path.commonpath([self.export_dir, target]) \
+                == self.export_dir
+        except ValueError:  # другой диск на Windows
+            inside = False
+        if not inside or target == self.export_dir:
+            raise ControlError(INVALID_PARAMS,
+                               f"путь вне каталога экспорта: {path}")
+        return target
+
+    def stopwatch_export(self, path, window=0):
+        """Круги в файл на стороне часов: .csv или двоичный формат.
+
+        path — относительно каталога экспорта (--export-dir). Файл
+        дописывается в фоне, между кадрами; ответ — число кругов."""
+        target = self._export_path(path)
+        try:
+            return self._card("S", window).start_export(target)
+        except (OSError, RuntimeError) as exc:
+            raise ControlError(INVALID_PARAMS, str(exc)) from None
+
+    # ---------- таймер обратного отсчёта (C) ----------
+
+    @staticmethod
+    def _timer_state(card):
+        return {"running": card.running,
+                "remaining": card.countdown.remaining_ns() / NS_PER_SEC}
+
+    def timer_get(self, window=0):
+        return self._timer_state(self._card("C", window))
+
+    def timer_set(self, seconds, start=False, window=0):
+        card = self._card("C", window)
+        card.set_seconds(self._seconds(seconds))
+        if start and seconds > 0:
+            card.toggle_start()
+        return self._timer_state(card)
+
+    def timer_start(self, window=0):
+        card = self._card("C", window)
+        if not card.running:
+            card.toggle_start()
+        return self._timer_state(card)
+
+    def timer_pause(self, window=0):
+        card = self._card("C", window)
+        if card.running:
+            card.toggle_start()
+        return self._timer_state(card)
+
+    def timer_reset(self, window=0):
+        card = self._card("C", window)
+        card.reset()
+        return self._timer_state(card)
+
+    # ---------- таймеры и будильники (T) ----------
+
+    def timers_add(self, name, seconds, repeat=False):
+        seconds = self._seconds(seconds)
+        if repeat and seconds <= 0:
+            raise ControlError(INVALID_PARAMS, "повтор с периодом 0")
+        self.loop.alarms.add_timer(str(name), round(seconds * NS_PER_SEC),
+                                   repeat=bool(repeat))
+        self.timers_changed = True
+        return str(name)
+
+    def alarms_add(self, name, time, repeat=False):
+        hms = parse_hms(str(time))
+        if hms is None or hms[0] > 23 or hms[1] > 59 or hms[2] > 59:
+            raise ControlError(INVALID_PARAMS, f"нужно ЧЧ:ММ:СС: {time!r}")
+        entry = self.loop.alarms.add_alarm(str(name), hms,
+                                           repeat=bool(repeat))
+        self.timers_changed = True
+        return {"name": entry.name, "at": entry.deadline}
+
+    def timers_cancel(self, name):
+        cancelled = self.loop.alarms.cancel(str(name))
+        self.timers_changed = self.timers_changed or cancelled
+        return cancelled
+
+    def timers_list(self, count=20):
+        return [
+            {"name": entry.name, "kind": entry.kind, "remaining": left,
+             "repeat": entry.repeat, "fired": entry.fired}
+            for left, entry in self.loop.alarms.upcoming(int(count))
+        ]
 
 
 # ---------------------------------------------------------
@@ -698,6 +1933,75 @@ class ClockApp:
 # ---------------------------------------------------------
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Clock Suite")
+    parser.add_argument(
+        "--metrics-dump", metavar="FILE",
+        help="включить замеры и периодически сбрасывать их в JSON"
+    )
+    parser.add_argument(
+        "--startup-times", action="store_true",
+        help="вывести разбивку времени старта по этапам"
+    )
+    parser.add_argument(
+        "--sweep", action="store_true",
+        help="плавная секундная стрелка (25 кадров в секунду)"
+    )
+    parser.add_argument(
+        "--low-power", action="store_true", default=LOW_POWER,
+        help="экономия батареи: стрелка шагает раз в секунду "
+             "(или CLOCK_LOW_POWER=1)"
+    )
+    parser.add_argument(
+        "--timers", metavar="FILE",
+        help="загрузить таймеры: строки «timer|alarm;имя;ЧЧ:ММ:СС[;repeat]»"
+    )
+    parser.add_argument(
+        "--zones", metavar="SPEC",
+        help="пояса для карточки W: all, файл (по поясу в строке) "
+             "или список через запятую"
+    )
+    parser.add_argument(
+        "--theme", choices=sorted(THEMES), default=DEFAULT_THEME.name,
+        help="оформление (night — тусклое, для экрана на стене)"
+    )
+    parser.add_argument(
+        "--control", nargs="?", const="", default=None, metavar="ADDRESS",
+        help="управление извне по JSON-RPC: путь Unix-сокета или "
+             "host:port (по умолчанию CLOCK_CONTROL или сокет во "
+             "временном каталоге); клиент — control.py"
+    )
+    parser.add_argument(
+        "--export-dir", metavar="DIR",
+        help="каталог, куда stopwatch.export по управлению может "
+             "сохранять круги (без него экспорт извне выключен)"
+    )
+    parser.add_argument(
+        "--windows", type=int, default=1, metavar="N",
+        help="сразу открыть N окон (например, по одному на монитор); "
+             "цикл и кэши у них общие"
+    )
+    args = parser.parse_args()
+
+    startup = StartupTimer(start=_import_started)
+    startup.mark("import")
     root = tk.Tk()
-    app = ClockApp(root)
+    startup.mark("tk_init")
+
+    try:
+        zones = check_zones(parse_zones(args.zones))
+    except (OSError, ValueError) as exc:
+        parser.error(f"--zones: {exc}")
+
+    app = ClockApp(root, metrics_dump=args.metrics_dump, startup=startup,
+                   theme=THEMES[args.theme], sweep=args.sweep,
+                   low_power=args.low_power, timers_file=args.timers,
+                   world_zones=zones)
+    for _ in range(args.windows - 1):
+        app.open_window()
+    if args.control is not None:
+        server = app.loop.serve_control(args.control or None,
+                                        args.export_dir)
+        print(f"управление: {server.address}", file=sys.stderr)
+    if args.startup_times:
+        root.after(2000, lambda: print(startup.report(), file=sys.stderr))
     app.start()
\ No newline at end of file
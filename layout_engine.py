@@ -0,0 +1,99 @@
+"""Раскладка карточек по сетке, разница между раскладками и индекс мест
+вставки для перетаскивания.
+
+Здесь нет Tk: на вход — словарь ``ClockApp.layout``
+({ключ: {"visible", "col", "order"}}), на выходе — позиции в сетке.
+Так ``relayout`` трогает только карточки, которые реально сдвинулись.
+"""
+
+from bisect import bisect_right
+
+
+def column_keys(layout, col):
+    """Видимые карточки столбца col в порядке сверху вниз."""
+    items = [
+        k for k, meta in layout.items()
+        if meta["visible"] and meta["col"] == col
+    ]
+    items.sort(key=lambda k: layout[k]["order"])
+    return items
+
+
+def grid_positions(layout, columns=(0, 1)):
+    """{ключ: (строка, столбец)} для всех видимых карточек."""
+    positions = {}
+    for col in columns:
+        for row, key in enumerate(column_keys(layout, col)):
+            positions[key] = (row, col)
+    return positions
+
+
+def diff_positions(old, new):
+    """Что поменять, чтобы из раскладки old получить new.
+
+    Возвращает (убрать, поставить): список ключей для ``grid_forget`` и
+    {ключ: (строка, столбец)} для карточек, которые появились или
+    сдвинулись. Оставшиеся на месте карточки не попадают никуда.
+    """
+    remove = [key for key in old if key not in new]
+    place = {
+        key: pos for key, pos in new.items()
+        if old.get(key) != pos
+    }
+    return remove, place
+
+
+def row_count(positions):
+    return max((row + 1 for row, _ in positions.values()), default=0)
+
+
+class SlotIndex:
+    """Снимок положения карточек для перетаскивания.
+
+    Строится один раз после раскладки (координаты уже не меняются, пока
+    сетка та же), а на каждое движение мыши место вставки ищется
+    бинарным поиском по центрам карточек — без запросов к Tk.
+    """
+
+    def __init__(self, boxes):
+        # boxes: {столбец: [(ключ, верх, низ), ...]} сверху вниз
+        self.boxes = {
+            col: sorted(items, key=lambda item: item[1])
+            for col, items in boxes.items()
+        }
+
+    def for_drag(self, key):
+        """Индекс без перетаскиваемой карточки: (ключи, центры, рамки)."""
+        slots = {}
+        for col, items in self.boxes.items():
+            rest = [item for item in items if item[0] != key]
+            slots[col] = (
+                [k for k, _, _ in rest],
+                [(top + bottom) / 2 for _, top, bottom in rest],
+                [(top, bottom) for _, top, bottom in rest],
+            )
+        return DragSlots(slots)
+
+
+class DragSlots:
+    def __init__(self, slots):
+        self.slots = slots
+
+    def keys(self, col):
+        return self.slots.get(col, ([], [], []))[0]
+
+    def insert_index(self, col, y):
+        """Куда вставить карточку, отпущенную на высоте y."""
+        centers = self.slots.get(col, ([], [], []))[1]
+        return bisect_right(centers, y)
+
+    def marker_y(self, col, index, gap=6):
+        """Высота линии-призрака для места вставки index."""
+        boxes = self.slots.get(col, ([], [], []))[2]
+        if not boxes:
+            return 0
+        if index == 0:
+            return max(boxes[0][0] - gap / 2, 0)
+        if index >= len(boxes):
+            return boxes[-1][1] + gap / 2
+        return (boxes[index - 1][1] + boxes[index][0]) / 2
@@ -0,0 +1,89 @@
+"""Отрисовка циферблата без дисплея: в RGB-буфер и дальше в PNG/PPM.
+
+Картинка та же, что на экране: неподвижный слой берётся из dial_ppm(),
+а стрелки и точка в центре дорисовываются тем же растеризатором.
+
+    python offscreen.py -o clock.png --size 500 --time 10:08:30
+"""
+
+import argparse
+import datetime
+
+from dial import dial_ppm
+from face import CARD_STYLE, HAND_LENGTHS, WINDOW_STYLE
+from geometry import hand_point, hand_turns
+from raster import Raster
+from themes import DEFAULT_THEME, THEMES
+
+
+def render_face(width, height=None, when=None, sweep=True, style=None,
+                theme=DEFAULT_THEME):
+    """Циферблат на холсте width×height к моменту ``when`` (datetime)."""
+    if height is None:
+        height = width
+    if when is None:
+        when = datetime.datetime.now()
+    if style is None:
+        style = CARD_STYLE
+    edge, center, bg, ink = theme.dial_colors
+
+    size = min(width, height)
+    cx = width / 2
+    cy = height / 2
+    radius = size / 2 - style["margin"]
+
+    canvas = Raster(width, height, bg=bg)
+    if radius <= 0:
+        return canvas
+
+    # Неподвижный слой — как картинка фона на холсте Tk (anchor center)
+    font_px = max(int(size / 18), style["min_font"])
+    dial = Raster.from_ppm(
+        dial_ppm(int(radius), font_px, edge, center, bg, ink)
+    )
+    canvas.blit(dial, int(cx - dial.width / 2), int(cy - dial.height / 2))
+
+    # Стрелки
+    hand_colors = (theme.hand, theme.hand, theme.second_hand)
+    for turn, length, div, low, color in zip(
+        hand_turns(when, sweep=sweep), HAND_LENGTHS,
+        style["hand_divisors"], style["hand_min"], hand_colors
+    ):
+        x, y = hand_point(turn, cx, cy, radius * length)
+        canvas.line(cx, cy, x, y, max(int(size / div), low), color)
+
+    # Точка в центре: заливка цвета секундной стрелки, обводка толщиной 2
+    dot_r = max(int(size / 80), style["dot_min"])
+    canvas.disc(cx, cy, dot_r + 1, theme.ink)
+    canvas.disc(cx, cy, dot_r - 1, theme.second_hand)
+    return canvas
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Сохранить циферблат в PNG/PPM без дисплея"
+    )
+    parser.add_argument("-o", "--output", default="clock.png",
+                        help="файл .png или .ppm")
+    parser.add_argument("--size", type=int, default=500,
+                        help="сторона картинки в пикселях")
+    parser.add_argument("--time", help="ЧЧ:ММ:СС (по умолчанию — сейчас)")
+    parser.add_argument("--window", action="store_true",
+                        help="пропорции отдельного окна, а не карточки")
+    parser.add_argument("--theme", choices=sorted(THEMES),
+                        default=DEFAULT_THEME.name)
+    args = parser.parse_args(argv)
+
+    when = datetime.datetime.now()
+    if args.time:
+        when = datetime.datetime.combine(
+            when.date(), datetime.time.fromisoformat(args.time)
+        )
+
+    style = WINDOW_STYLE if args.window else CARD_STYLE
+    render_face(args.size, when=when, style=style,
+                theme=THEMES[args.theme]).save(args.output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,282 @@
+"""Маленький программный растеризатор: RGB-буфер, сглаженные линии, кольца
+и штриховой шрифт для цифр. Без Tk и без сторонних библиотек."""
+
+import math
+import struct
+import zlib
+
+# Штриховой шрифт: каждая цифра — набор ломаных в рамке 0.6 × 1.0
+# (y вниз). Высота рамки равна высоте цифры.
+GLYPH_WIDTH = 0.6
+GLYPH_GAP = 0.08
+GLYPHS = {
+    "0": [[(0.3, 0.0), (0.5, 0.08), (0.58, 0.3), (0.58, 0.7), (0.5, 0.92),
+           (0.3, 1.0), (0.1, 0.92), (0.02, 0.7), (0.02, 0.3), (0.1, 0.08),
+           (0.3, 0.0)]],
+    "1": [[(0.12, 0.2), (0.36, 0.0), (0.36, 1.0)]],
+    "2": [[(0.03, 0.22), (0.1, 0.07), (0.3, 0.0), (0.5, 0.07), (0.57, 0.25),
+           (0.5, 0.42), (0.03, 1.0), (0.58, 1.0)]],
+    "3": [[(0.05, 0.12), (0.2, 0.0), (0.42, 0.0), (0.55, 0.12), (0.55, 0.35),
+           (0.42, 0.47), (0.22, 0.48)],
+          [(0.42, 0.49), (0.57, 0.62), (0.57, 0.86), (0.42, 1.0), (0.18, 1.0),
+           (0.03, 0.88)]],
+    "4": [[(0.45, 1.0), (0.45, 0.0), (0.02, 0.7), (0.6, 0.7)]],
+    "5": [[(0.55, 0.0), (0.1, 0.0), (0.05, 0.45), (0.3, 0.38), (0.5, 0.45),
+           (0.58, 0.65), (0.55, 0.87), (0.4, 1.0), (0.18, 1.0), (0.03, 0.88)]],
+    "6": [[(0.52, 0.1), (0.38, 0.0), (0.2, 0.02), (0.07, 0.2), (0.03, 0.5),
+           (0.05, 0.8), (0.18, 0.98), (0.4, 1.0), (0.55, 0.85), (0.57, 0.65),
+           (0.45, 0.45), (0.25, 0.42), (0.1, 0.5), (0.04, 0.62)]],
+    "7": [[(0.02, 0.0), (0.58, 0.0), (0.25, 1.0)]],
+    "8": [[(0.3, 0.0), (0.5, 0.06), (0.54, 0.24), (0.42, 0.44), (0.3, 0.47),
+           (0.18, 0.44), (0.06, 0.24), (0.1, 0.06), (0.3, 0.0)],
+          [(0.3, 0.47), (0.5, 0.55), (0.58, 0.75), (0.5, 0.95), (0.3, 1.0),
+           (0.1, 0.95), (0.02, 0.75), (0.1, 0.55), (0.3, 0.47)]],
+    "9": [[(0.08, 0.9), (0.22, 1.0), (0.4, 0.98), (0.53, 0.8), (0.57, 0.5),
+           (0.55, 0.2), (0.42, 0.02), (0.2, 0.0), (0.05, 0.15), (0.03, 0.35),
+           (0.15, 0.55), (0.35, 0.58), (0.5, 0.5), (0.56, 0.38)]],
+}
+
+
+def parse_color(color):
+    """'#rrggbb' или (r, g, b) -> (r, g, b)."""
+    if isinstance(color, str):
+        color = color.lstrip("#")
+        return tuple(int(color[i:i + 2], 16) for i in (0, 2, 4))
+    return tuple(color)
+
+
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+
+
+def png_chunk(kind, data):
+    crc = zlib.crc32(kind + data) & 0xFFFFFFFF
+    return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", crc)
+
+
+def alpha_idat(rows):
+    """Сжатые строки маски прозрачности (по байту на пиксель) для IDAT."""
+    return zlib.compress(b"".join(b"\x00" + row for row in rows), 6)
+
+
+def alpha_png(width, height, idat, color):
+    """PNG одного цвета с прозрачностью из маски (см. alpha_idat).
+
+    Картинка палитровая: индекс пикселя — его непрозрачность, а цвет
+    задаёт палитра. Поэтому маску можно сжать заранее, а перекраска —
+    это только другая палитра.
+    """
+    rgb = bytes(parse_color(color))
+    ihdr = struct.pack(">IIBBBBB", width, height, 8, 3, 0, 0, 0)
+    return (PNG_SIGNATURE + png_chunk(b"IHDR", ihdr) +
+            png_chunk(b"PLTE", rgb * 256) +
+            png_chunk(b"tRNS", bytes(range(256))) +
+            png_chunk(b"IDAT", idat) + png_chunk(b"IEND", b""))
+
+
+class Raster:
+    def __init__(self, width, height, bg=(0, 0, 0), data=None):
+        self.width = width
+        self.height = height
+        if data is not None:
+            self.pixels = bytearray(data)
+        else:
+            self.pixels = bytearray(bytes(parse_color(bg)) * (width * height))
+
+    @classmethod
+    def from_ppm(cls, data):
+        """Разбор двоичного PPM (P6, 8 бит) — например, из dial_ppm()."""
+        magic, width, height, maxval = data[:64].split(maxsplit=4)[:4]
+        if magic != b"P6" or maxval != b"255":
+            raise ValueError("ожидается PPM P6 с глубиной 255")
+        width = int(width)
+        height = int(height)
+        # Ровно один пробельный символ после maxval, дальше — пиксели
+        return cls(width, height, data=data[-width * height * 3:])
+
+    def blit(self, other, x, y):
+        """Копирует другой растр так, чтобы его левый верхний угол был в (x, y)."""
+        left = max(x, 0)
+        right = min(x + other.width, self.width)
+        if left >= right:
+            return
+        stride = self.width * 3
+        other_stride = other.width * 3
+        for oy in range(max(-y, 0), min(other.height, self.height - y)):
+            dst = (y + oy) * stride
+            src = oy * other_stride
+            self.pixels[dst + left * 3:dst + right * 3] = \
+                other.pixels[src + (left - x) * 3:src + (right - x) * 3]
+
+    # ---------- смешивание ----------
+
+    def _fill_coverage(self, coverage, color):
+        """Накладывает цвет с прозрачностью из {индекс пикселя: 0..1}."""
+        r, g, b = parse_color(color)
+        px = self.pixels
+        for idx, a in coverage.items():
+            i = idx * 3
+            if a >= 1.0:
+                px[i] = r
+                px[i + 1] = g
+                px[i + 2] = b
+            else:
+                px[i] = int(px[i] + (r - px[i]) * a)
+                px[i + 1] = int(px[i + 1] + (g - px[i + 1]) * a)
+                px[i + 2] = int(px[i + 2] + (b - px[i + 2]) * a)
+
+    def _segment_coverage(self, coverage, x1, y1, x2, y2, half):
+        """Покрытие толстого отрезка (скруглённые концы), по максимуму."""
+        w, h = self.width, self.height
+        left = max(int(min(x1, x2) - half - 1), 0)
+        right = min(int(max(x1, x2) + half + 2), w)
+        top = max(int(min(y1, y2) - half - 1), 0)
+        bottom = min(int(max(y1, y2) + half + 2), h)
+
+        dx = x2 - x1
+        dy = y2 - y1
+        length2 = dx * dx + dy * dy
+        edge = half + 0.5
+        if length2:
+            length = math.sqrt(length2)
+            nx = -dy / length * edge
+            ny = dx / length * edge
+
+        for y in range(top, bottom):
+            py = y + 0.5 - y1
+            row = y * w
+
+            # Строка пересекает «капсулу» отрезка по одному интервалу:
+            # его концы — на скруглениях или на сдвинутых краях отрезка.
+            # Так тонкая наклонная линия не обходит весь свой квадрат.
+            xs = []
+            for ex, ey in ((0.0, 0.0), (dx, dy)):
+                r2 = edge * edge - (py - ey) ** 2
+                if r2 >= 0.0:
+                    r = math.sqrt(r2)
+                    xs.append(ex - r)
+                    xs.append(ex + r)
+            if length2 and dy:
+                for sx, sy in ((nx, ny), (-nx, -ny)):
+                    t = (py - sy) / dy
+                    if 0.0 <= t <= 1.0:
+                        xs.append(t * dx + sx)
+            if not xs:
+                continue
+            row_left = max(int(x1 + min(xs)) - 1, left)
+            row_right = min(int(x1 + max(xs)) + 2, right)
+
+            for x in range(row_left, row_right):
+                px = x + 0.5 - x1
+                if length2:
+                    t = (px * dx + py * dy) / length2
+                    t = 0.0 if t < 0.0 else 1.0 if t > 1.0 else t
+                    ex = px - t * dx
+                    ey = py - t * dy
+                else:
+                    ex, ey = px, py
+                a = edge - math.sqrt(ex * ex + ey * ey)
+                if a <= 0.0:
+                    continue
+                if a > 1.0:
+                    a = 1.0
+                idx = row + x
+                if a > coverage.get(idx, 0.0):
+                    coverage[idx] = a
+
+    # ---------- примитивы ----------
+
+    def coverage(self, polylines, width):
+        """{индекс пикселя: 0..1} для ломаных толщины width."""
+        coverage = {}
+        half = width / 2
+        for points in polylines:
+            if len(points) == 1:
+                points = points * 2
+            for (x1, y1), (x2, y2) in zip(points, points[1:]):
+                self._segment_coverage(coverage, x1, y1, x2, y2, half)
+        return coverage
+
+    def stroke(self, polylines, width, color):
+        """Ломаные одной толщины; стыки не темнеют от двойного наложения."""
+        self._fill_coverage(self.coverage(polylines, width), color)
+
+    def line(self, x1, y1, x2, y2, width, color):
+        self.stroke([[(x1, y1), (x2, y2)]], width, color)
+
+    def ring(self, cx, cy, radius, width, color):
+        """Окружность толщины width с центром линии на радиусе radius."""
+        self._round(cx, cy, radius, width / 2, color)
+
+    def disc(self, cx, cy, radius, color):
+        """Закрашенный круг."""
+        self._round(cx, cy, radius / 2, radius / 2, color)
+
+    def _round(self, cx, cy, mid, half, color):
+        # Пиксели, у которых |d - mid| < half (+0.5 на сглаживание)
+        outer = mid + half + 1
+        top = max(int(cy - outer), 0)
+        bottom = min(int(cy + outer) + 1, self.height)
+        left = max(int(cx - outer), 0)
+        right = min(int(cx + outer) + 1, self.width)
+        edge = half + 0.5
+        inner2 = max(mid - half - 1, 0) ** 2
+        coverage = {}
+        for y in range(top, bottom):
+            dy = y + 0.5 - cy
+            row = y * self.width
+            for x in range(left, right):
+                dx = x + 0.5 - cx
+                d2 = dx * dx + dy * dy
+                if d2 < inner2:
+                    continue
+                a = edge - abs(math.sqrt(d2) - mid)
+                if a > 0.0:
+                    coverage[row + x] = a if a < 1.0 else 1.0
+        self._fill_coverage(coverage, color)
+
+    def text(self, cx, cy, text, height, color, bold=True):
+        """Цифры штриховым шрифтом, центр строки — в (cx, cy)."""
+        advance = (GLYPH_WIDTH + GLYPH_GAP) * height
+        total = advance * len(text) - GLYPH_GAP * height
+        x0 = cx - total / 2
+        y0 = cy - height / 2
+        pen = height * (0.14 if bold else 0.09)
+        # Рамка глифа — по осевой линии штриха, сожмём её на полштриха
+        inset = pen / 2
+        scale_x = GLYPH_WIDTH * height - 2 * inset
+        scale_y = height - 2 * inset
+
+        polylines = []
+        for i, ch in enumerate(text):
+            gx = x0 + i * advance + inset
+            for line in GLYPHS.get(ch, []):
+                polylines.append([
+                    (gx + u / GLYPH_WIDTH * scale_x, y0 + inset + v * scale_y)
+                    for u, v in line
+                ])
+        self.stroke(polylines, pen, color)
+
+    # ---------- вывод ----------
+
+    def ppm(self):
+        header = f"P6\n{self.width} {self.height}\n255\n".encode("ascii")
+        return header + bytes(self.pixels)
+
+    def png(self):
+        """RGB PNG без сторонних библиотек (zlib из стандартной)."""
+        stride = self.width * 3
+        px = bytes(self.pixels)
+        raw = b"".join(
+            b"\x00" + px[y * stride:(y + 1) * stride]
+            for y in range(self.height)
+        )
+        ihdr = struct.pack(">IIBBBBB", self.width, self.height, 8, 2, 0, 0, 0)
+        return (PNG_SIGNATURE + png_chunk(b"IHDR", ihdr) +
+                png_chunk(b"IDAT", zlib.compress(raw, 6)) +
+                png_chunk(b"IEND", b""))
+
+    def save(self, path):
+        """Сохранить в .png или .ppm — по расширению файла."""
+        data = self.png() if str(path).lower().endswith(".png") else self.ppm()
+        with open(path, "wb") as f:
+            f.write(data)
@@ -0,0 +1,61 @@
+"""Планировщик перерисовки: сливает шквал <Configure> в один кадр."""
+
+
+class RedrawScheduler:
+    """Не больше одной перерисовки за кадр.
+
+    Пока окно тянут мышью, раз в кадр вызывается дешёвый ``fast``
+    (например, только масштабирование готовых элементов). Когда события
+    перестают приходить ``settle_ms`` миллисекунд, один раз вызывается
+    полноценный ``redraw``.
+    """
+
+    def __init__(self, widget, redraw, fast=None, frame_ms=16, settle_ms=150):
+        self.widget = widget
+        self.redraw = redraw
+        self.fast = fast
+        self.frame_ms = frame_ms
+        self.settle_ms = settle_ms
+
+        self._frame_job = None
+        self._settle_job = None
+
+    def request(self):
+        """Сообщить, что размер изменился. Можно звать на каждое событие."""
+        if self._frame_job is None:
+            self._frame_job = self.widget.after(self.frame_ms, self._on_frame)
+
+        if self.fast is None:
+            return
+
+        # Таймер «успокоения» перезапускается на каждое событие
+        if self._settle_job is not None:
+            self.widget.after_cancel(self._settle_job)
+        self._settle_job = self.widget.after(self.settle_ms, self._on_settle)
+
+    def flush(self):
+        """Отменить ожидание и сразу сделать полную перерисовку."""
+        self.cancel()
+        self.redraw()
+
+    def cancel(self):
+        if self._frame_job is not None:
+            self.widget.after_cancel(self._frame_job)
+            self._frame_job = None
+        if self._settle_job is not None:
+            self.widget.after_cancel(self._settle_job)
+            self._settle_job = None
+
+    def _on_frame(self):
+        self._frame_job = None
+        if self.fast is not None:
+            self.fast()
+        else:
+            self.redraw()
+
+    def _on_settle(self):
+        self._settle_job = None
+        if self._frame_job is not None:
+            self.widget.after_cancel(self._frame_job)
+            self._frame_job = None
+        self.redraw()
@@ -0,0 +1,191 @@
+"""Планировщик тиков по дедлайнам вместо фиксированных ``after(N)``.
+
+Следующее пробуждение считается от монотонных часов, поэтому время,
+потраченное на сам тик, не накапливается в дрейф. С ``align=True``
+дедлайны ставятся на кратные периоду моменты настенного времени
+(для периода 1000 мс — ровно на границы секунд), и цифры меняются
+сразу после смены секунды, а не с запозданием до целого периода.
+
+Там же — слежение за тем, видно ли окно (свёрнуто, закрыто другими
+окнами), и режим экономии энергии: лишние пробуждения процесса на
+планшете от батареи стоят заряда.
+"""
+
+import math
+import os
+import time
+from collections import deque
+
+# Небольшой запас после границы, чтобы не проснуться на долю мс раньше
+ALIGN_MARGIN = 0.002
+
+# Режим экономии: секундная стрелка шагает раз в секунду вместо плавного
+# хода 25 раз в секунду. CLOCK_LOW_POWER=1 — для всех скриптов сразу.
+LOW_POWER = os.environ.get("CLOCK_LOW_POWER", "") not in ("", "0")
+
+
+class TickScheduler:
+    def __init__(self, widget, callback, period_ms=1000, align=False,
+                 history=600):
+        self.widget = widget
+        self.callback = callback
+        self.period = period_ms / 1000.0
+        self.align = align
+
+        self.running = False
+        self.skipped = 0
+        # Опоздание каждого пробуждения относительно дедлайна (секунды)
+        self.jitter = deque(maxlen=history)
+
+        self._deadline = None
+        self._job = None
+        # Идёт callback: poke/wake_in только сдвигают дедлайн, а новое
+        # пробуждение поставит сам _fire (иначе цепочек after станет две)
+        self._firing = False
+        # Разовое пробуждение раньше очередного тика (см. wake_in)
+        self._wake_at = None
+
+    def start(self):
+        """Первый тик сразу, дальше — по расписанию."""
+        if self.running:
+            return
+        self.running = True
+        self._deadline = time.monotonic()
+        self._fire()
+
+    def stop(self):
+        self.running = False
+        self._cancel()
+
+    def set_period(self, period_ms):
+        """Новый период действует со следующего пробуждения."""
+        self.period = period_ms / 1000.0
+
+    def wake_in(self, seconds):
+        """Следующий тик — не позже чем через seconds (только один раз).
+
+        Обычно вызывается из callback: например, при редких тиках в
+        фоне, чтобы обратный отсчёт всё равно закончился вовремя.
+        """
+        wake_at = time.monotonic() + max(seconds, 0.0)
+        if self._wake_at is None or wake_at < self._wake_at:
+            self._wake_at = wake_at
+        if self.running and not self._firing and self._job is not None \
+                and wake_at < self._deadline:
+            self._schedule()
+
+    def poke(self):
+        """Тик как можно скорее (например, после действия пользователя)."""
+        if not self.running:
+            return
+        if self._firing:
+            self._wake_at = time.monotonic()
+            return
+        self._cancel()
+        self._deadline = time.monotonic()
+        self._job = self.widget.after_idle(self._fire)
+
+    def _cancel(self):
+        if self._job is not None:
+            self.widget.after_cancel(self._job)
+            self._job = None
+
+    def _next_deadline(self, now):
+        if self.align:
+            wall = time.time()
+            slot = math.floor(wall / self.period) + 1
+            deadline = now + (slot * self.period - wall) + ALIGN_MARGIN
+            missed = round((deadline - self._deadline) / self.period) - 1
+            if missed > 0:
+                self.skipped += missed
+            return deadline
+
+        deadline = self._deadline + self.period
+        if deadline <= now:
+            # Перегрузка: пропускаем кадры, а не догоняем их пачкой
+            missed = math.floor((now - deadline) / self.period) + 1
+            self.skipped += missed
+            deadline += missed * self.period
+        return deadline
+
+    def _schedule(self):
+        # Пробуждение всегда одно: уже поставленное снимаем
+        self._cancel()
+        now = time.monotonic()
+        self._deadline = self._next_deadline(now)
+        if self._wake_at is not None:
+            self._deadline = min(self._deadline, self._wake_at)
+            self._wake_at = None
+        delay_ms = max(math.ceil((self._deadline - now) * 1000), 0)
+        self._job = self.widget.after(delay_ms, self._fire)
+
+    def _fire(self):
+        self._job = None
+        if not self.running:
+            return
+        self.jitter.append(time.monotonic() - self._deadline)
+        self._firing = True
+        try:
+            self.callback()
+        finally:
+            self._firing = False
+            if self.running:
+                self._schedule()
+
+    def jitter_stats(self):
+        """Сводка опозданий в миллисекундах: среднее, p95, максимум."""
+        if not self.jitter:
+            return {"count": 0, "mean_ms": 0.0, "p95_ms": 0.0,
+                    "max_ms": 0.0, "skipped": self.skipped}
+        values = sorted(self.jitter)
+        p95 = values[min(int(len(values) * 0.95), len(values) - 1)]
+        return {
+            "count": len(values),
+            "mean_ms": sum(values) / len(values) * 1000,
+            "p95_ms": p95 * 1000,
+            "max_ms": values[-1] * 1000,
+            "skipped": self.skipped,
+        }
+
+
+class WindowVisibility:
+    """Видно ли окно верхнего уровня: не свёрнуто (<Map>/<Unmap>) и не
+    закрыто целиком другими окнами (<Visibility>).
+
+    on_change(hidden) вызывается только при смене состояния. Пока окно
+    ни разу не показано, оно считается видимым — первые тики нужны.
+    """
+
+    def __init__(self, toplevel, on_change=None):
+        self.toplevel = toplevel
+        self.on_change = on_change
+        self.mapped = True
+        self.obscured = False
+        # add="+": у окна могут быть и другие обработчики этих событий
+        toplevel.bind("<Map>", self._on_map, add="+")
+        toplevel.bind("<Unmap>", self._on_unmap, add="+")
+        toplevel.bind("<Visibility>", self._on_visibility, add="+")
+
+    @property
+    def hidden(self):
+        return not self.mapped or self.obscured
+
+    def _update(self, mapped, obscured):
+        was_hidden = self.hidden
+        self.mapped = mapped
+        self.obscured = obscured
+        if self.hidden != was_hidden and self.on_change is not None:
+            self.on_change(self.hidden)
+
+    # Привязки окна верхнего уровня срабатывают и для всех его потомков
+    def _on_map(self, event):
+        if event.widget is self.toplevel:
+            self._update(True, self.obscured)
+
+    def _on_unmap(self, event):
+        if event.widget is self.toplevel:
+            self._update(False, self.obscured)
+
+    def _on_visibility(self, event):
+        if event.widget is self.toplevel:
+            self._update(self.mapped, event.state == "VisibilityFullyObscured")
@@ -0,0 +1,239 @@
+"""Сглаженные стрелки: заранее нарисованные спрайты вместо линий Tk.
+
+Линии холста Tk не сглаживаются, и на больших размерах стрелки
+«лесенкой». Рисовать их растеризатором на каждом кадре слишком
+медленно, поэтому для каждой стрелки (длина, толщина) готовится атлас:
+по спрайту на каждый шаг угла. На кадре остаётся только выбрать
+готовый спрайт и передвинуть картинку.
+
+Атлас рисует фоновый поток, интерфейс его не ждёт: пока нужного
+спрайта нет, стрелка показывается обычной линией Tk. Считается только
+первая четверть оборота, остальные углы — её зеркальные отражения.
+Спрайт хранится сжатой маской прозрачности (см. ``raster.alpha_png``),
+поэтому смена цвета темы не требует перерисовки атласа.
+
+Чтобы изменение размера окна не перерисовывало все атласы, длина
+округляется (соседние размеры берут тот же атлас), шагов не больше,
+чем различимо на кончике стрелки, а отпущенные атласы ещё какое-то
+время хранятся в пуле.
+"""
+
+import math
+import queue
+import threading
+from collections import OrderedDict
+
+import tkinter as tk
+
+import geometry
+from raster import Raster, alpha_idat, alpha_png
+
+# Шагов угла на оборот (не больше): часовая (0.5°), минутная и
+# секундная (0.1°)
+SPRITE_STEPS = (720, 3600, 3600)
+
+# Длина атласа — кратная LENGTH_QUANTUM (стрелка короче или длиннее
+# линии максимум на 8 px)
+LENGTH_QUANTUM = 16
+# Шагов — кратно 240: ровные 60 позиций стрелки и целая четверть оборота
+STEP_QUANTUM = 240
+
+
+def atlas_key(length, width, max_steps):
+    """Ключ атласа: длина округлена, шагов — около одного на пиксель
+    окружности, которую описывает кончик стрелки, но не больше max_steps."""
+    length = max(round(length / LENGTH_QUANTUM), 1) * LENGTH_QUANTUM
+    steps = math.ceil(2 * math.pi * length / STEP_QUANTUM) * STEP_QUANTUM
+    return length, width, min(steps, max_steps)
+
+
+def mirror(index, steps):
+    """(шаг в первой четверти, отражать по x, отражать по y)."""
+    quarter = steps // 4
+    if index <= quarter:
+        return index, False, False
+    if index <= 2 * quarter:
+        return 2 * quarter - index, False, True
+    if index <= 3 * quarter:
+        return index - 2 * quarter, True, True
+    return steps - index, True, False
+
+
+def coarse_first(steps):
+    """Шаги первой четверти: сначала крупная сетка, потом всё мельче.
+
+    Так быстро появляются ровные позиции (например, 60 позиций
+    секундной стрелки, идущей шагами), а атлас дорисовывается потом.
+    """
+    quarter = steps // 4
+    order = []
+    seen = set()
+    for stride in (60, 10, 1):
+        for i in range(0, quarter + 1, stride):
+            if i not in seen:
+                seen.add(i)
+                order.append(i)
+    return order
+
+
+def hand_mask(length, width, turn):
+    """Маска стрелки из центра (0, 0): (x, y, ширина, высота, строки).
+
+    Центр — угол пикселя, поэтому зеркальные отражения маски точные.
+    """
+    ux, uy = geometry.hand_vector(turn)
+    tx, ty = length * ux, length * uy
+    # Рамка симметрична относительно центра — как и сами отражения
+    pad = width / 2 + 1
+    left = -math.ceil(max(0.0, -tx) + pad)
+    top = -math.ceil(max(0.0, -ty) + pad)
+    w = math.ceil(max(0.0, tx) + pad) - left
+    h = math.ceil(max(0.0, ty) + pad) - top
+
+    canvas = Raster(w, h)
+    coverage = canvas.coverage([[(-left, -top), (tx - left, ty - top)]],
+                               width)
+    mask = bytearray(w * h)
+    for idx, a in coverage.items():
+        mask[idx] = int(a * 255 + 0.5)
+    rows = [bytes(mask[y * w:(y + 1) * w]) for y in range(h)]
+    return left, top, w, h, rows
+
+
+def flip(left, top, w, h, rows, flip_x, flip_y):
+    if flip_x:
+        rows = [row[::-1] for row in rows]
+        left = -(left + w)
+    if flip_y:
+        rows = rows[::-1]
+        top = -(top + h)
+    return left, top, w, h, rows
+
+
+class HandAtlas:
+    """Спрайты одной стрелки для всех ``steps`` углов."""
+
+    def __init__(self, length, width, steps, cache_size=48):
+        self.length = length
+        self.width = width
+        self.steps = steps
+        self.cancelled = False
+        # {шаг: (x, y, ширина, высота, IDAT)} — пишет только поток-рисовальщик
+        self.sprites = {}
+        # Готовые картинки Tk: {(шаг, цвет): PhotoImage}, только главный поток
+        self._images = OrderedDict()
+        self.cache_size = cache_size
+
+    @property
+    def key(self):
+        return (self.length, self.width, self.steps)
+
+    @property
+    def done(self):
+        return len(self.sprites) >= self.steps
+
+    def build(self):
+        """Рисует атлас (в фоновом потоке); прерывается по cancelled.
+        Уже нарисованное пропускается — прерванный атлас дорисовывается."""
+        steps = self.steps
+        for base in coarse_first(steps):
+            if self.cancelled:
+                return
+            if base in self.sprites:
+                continue
+            mask = hand_mask(self.length, self.width, base / steps)
+            for index in {base, steps // 2 - base, steps // 2 + base,
+                          steps - base}:
+                index %= steps
+                _, flip_x, flip_y = mirror(index, steps)
+                left, top, w, h, rows = flip(*mask, flip_x, flip_y)
+                self.sprites[index] = (left, top, w, h, alpha_idat(rows))
+
+    def image(self, master, index, color):
+        """(PhotoImage, x, y) относительно центра или None, если спрайт
+        ещё не нарисован."""
+        sprite = self.sprites.get(index)
+        if sprite is None:
+            return None
+        left, top, w, h, idat = sprite
+
+        key = (index, color)
+        image = self._images.get(key)
+        if image is None:
+            image = tk.PhotoImage(master=master, format="png",
+                                  data=alpha_png(w, h, idat, color))
+            self._images[key] = image
+            while len(self._images) > self.cache_size:
+                self._images.popitem(last=False)
+        else:
+            self._images.move_to_end(key)
+        return image, left, top
+
+
+class SpriteWorker:
+    """Фоновый поток: задания рисуются по очереди. Задание — всё, у чего
+    есть ``cancelled`` и ``build()`` (атлас, картинка циферблата)."""
+
+    def __init__(self, name="sprite-atlas"):
+        self.name = name
+        self._queue = queue.Queue()
+        self._thread = None
+
+    def submit(self, atlas):
+        if self._thread is None:
+            # daemon — чтобы недорисованный атлас не держал выход из программы
+            self._thread = threading.Thread(
+                target=self._run, name=self.name, daemon=True
+            )
+            self._thread.start()
+        self._queue.put(atlas)
+        return atlas
+
+    def _run(self):
+        while True:
+            atlas = self._queue.get()
+            if not atlas.cancelled:
+                atlas.build()
+
+
+class AtlasPool:
+    """Атласы, общие для всех циферблатов процесса (в том числе в разных
+    окнах): одинаковая стрелка рисуется один раз. Когда атлас отпустил
+    последний циферблат, рисование прерывается, но сам атлас ещё
+    хранится (последние ``keep``): окно часто возвращают к прежнему
+    размеру, и тогда атлас берётся готовым или дорисовывается."""
+
+    def __init__(self, worker, keep=6):
+        self.worker = worker
+        self.keep = keep
+        self._atlases = {}  # {ключ: [атлас, сколько циферблатов держат]}
+        self._idle = OrderedDict()  # {ключ: атлас} — никем не занятые
+
+    def acquire(self, key):
+        entry = self._atlases.get(key)
+        if entry is None:
+            atlas = self._idle.pop(key, None)
+            if atlas is None:
+                atlas = self.worker.submit(HandAtlas(*key))
+            elif not atlas.done:
+                atlas.cancelled = False
+                self.worker.submit(atlas)
+            entry = self._atlases[key] = [atlas, 0]
+        entry[1] += 1
+        return entry[0]
+
+    def release(self, atlas):
+        entry = self._atlases.get(atlas.key)
+        if entry is None or entry[0] is not atlas:
+            return
+        entry[1] -= 1
+        if entry[1] <= 0:
+            atlas.cancelled = True
+            del self._atlases[atlas.key]
+            self._idle[atlas.key] = atlas
+            while len(self._idle) > self.keep:
+                self._idle.popitem(last=False)
+
+
+sprite_worker = SpriteWorker()
+atlas_pool = AtlasPool(sprite_worker)
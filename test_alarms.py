@@ -0,0 +1,27 @@
+import pytest
+
+from alarms import AlarmQueue, load_timers
+from timebase import NS_PER_SEC
+
+
+def test_load_timers_rejects_zero_period_repeat(tmp_path):
+    path = tmp_path / "timers.txt"
+    path.write_text("timer;ok;00:00:05\ntimer;x;00:00:00;repeat\n",
+                    encoding="utf-8")
+    queue = AlarmQueue()
+    with pytest.raises(ValueError, match=":2:"):
+        load_timers(str(path), queue)
+
+
+def test_add_timer_rejects_zero_period_repeat():
+    queue = AlarmQueue()
+    with pytest.raises(ValueError):
+        queue.add_timer("x", 0, repeat=True)
+    assert len(queue) == 0
+
+
+def test_one_shot_zero_timer_fires_once():
+    queue = AlarmQueue()
+    queue.add_timer("x", 0, now=0)
+    assert [e.name for e in queue.pop_due(now=1, now_ts=0)] == ["x"]
+    assert queue.pop_due(now=NS_PER_SEC, now_ts=0) == []
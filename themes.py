@@ -0,0 +1,107 @@
+"""Темы оформления: все цвета приложения в одном месте.
+
+Тема один раз готовит всё, что нужно при отрисовке: строки '#rrggbb'
+для Tk, кортежи RGB для растеризатора циферблата и палитру градиента
+под каждый радиус. Смена темы на лету перекрашивает уже существующие
+виджеты и элементы холста (``config``/``itemconfig``), ничего не
+пересоздавая.
+"""
+
+from dial import BG_COLOR, CENTER_COLOR, EDGE_COLOR, gradient_palette
+from raster import parse_color
+
+
+def hex_color(rgb):
+    return "#%02x%02x%02x" % tuple(rgb)
+
+
+class Theme:
+    def __init__(self, name, *, window, panel, header, text, text_dim,
+                 warning, accent, button_on, button_off, metrics,
+                 dial_edge, dial_center, ink, hand, second_hand):
+        self.name = name
+
+        # Виджеты Tk: строки цветов
+        self.window = window          # фон окна и карточек
+        self.panel = panel            # панель кнопок
+        self.header = header          # шапки карточек
+        self.text = text
+        self.text_dim = text_dim
+        self.warning = warning        # таймер на последней секунде
+        self.accent = accent          # линия-призрак при перетаскивании
+        self.button_on = button_on
+        self.button_off = button_off
+        self.metrics = metrics
+
+        # Холст: стрелки и точка в центре
+        self.hand = hand
+        self.second_hand = second_hand
+        self.ink = ink
+
+        # Растеризатор: те же цвета кортежами, готовые для ключа кэша
+        self.dial_colors = (
+            tuple(dial_edge), tuple(dial_center),
+            parse_color(window), parse_color(ink),
+        )
+        self._gradients = {}
+
+    def gradient(self, radius):
+        """Цвета '#rrggbb' для расстояний 0..radius от центра (из кэша)."""
+        colors = self._gradients.get(radius)
+        if colors is None:
+            edge, center = self.dial_colors[:2]
+            colors = [
+                hex_color(rgb)
+                for rgb in gradient_palette(radius, edge, center)
+            ]
+            self._gradients[radius] = colors
+        return colors
+
+
+class ThemedWidgets:
+    """Виджеты и роли их цветов: ``add(label, bg="window", fg="text")``."""
+
+    def __init__(self):
+        self.items = []
+
+    def add(self, widget, **roles):
+        self.items.append((widget, roles))
+        return widget
+
+    def apply(self, theme, configure):
+        """configure(widget, **опции) — config или update_widget карточки."""
+        for widget, roles in self.items:
+            configure(widget, **{
+                option: getattr(theme, role) for option, role in roles.items()
+            })
+
+
+DAY = Theme(
+    "day",
+    window=hex_color(BG_COLOR), panel="#333333", header="#444444",
+    text="#ffffff", text_dim="#dddddd", warning="#ff5555",
+    accent="#88aaff", button_on="#555555", button_off="#222222",
+    metrics="#aaffaa",
+    dial_edge=EDGE_COLOR, dial_center=CENTER_COLOR,
+    ink="#000000", hand="#000000", second_hand="#ff0000",
+)
+
+# Для круглосуточного экрана на стене: чёрный фон, тусклый
+# циферблат и приглушённые красные тона, которые не слепят в темноте
+NIGHT = Theme(
+    "night",
+    window="#000000", panel="#0a0a0a", header="#161010",
+    text="#a04840", text_dim="#703430", warning="#e03020",
+    accent="#502820", button_on="#301a18", button_off="#000000",
+    metrics="#705040",
+    dial_edge=(26, 20, 20), dial_center=(44, 34, 32),
+    ink="#9a4a40", hand="#9a4a40", second_hand="#c03020",
+)
+
+THEMES = {theme.name: theme for theme in (DAY, NIGHT)}
+DEFAULT_THEME = DAY
+
+
+def next_theme(theme):
+    names = list(THEMES)
+    return THEMES[names[(names.index(theme.name) + 1) % len(names)]]
@@ -0,0 +1,95 @@
+"""Единая шкала времени для секундомера и таймера.
+
+Всё считается в целых наносекундах от ``time.perf_counter_ns()``:
+он монотонный (переводы часов и NTP на него не влияют) и самый точный
+(на Windows ``monotonic_ns`` тикает по ~16 мс). Прошедшее время — не
+сумма приращений за тики, а разница «сейчас − старт» плюс уже
+накопленные до паузы отрезки, поэтому ошибка не растёт со временем.
+"""
+
+import time
+
+NS_PER_SEC = 1_000_000_000
+
+now_ns = time.perf_counter_ns
+
+
+class Span:
+    """Отрезок времени с паузами: старт, пауза, сброс."""
+
+    def __init__(self):
+        self.accumulated_ns = 0  # сумма закрытых отрезков (до паузы)
+        self.started_ns = None   # начало текущего отрезка, если идёт
+
+    @property
+    def running(self):
+        return self.started_ns is not None
+
+    def start(self, now=None):
+        if self.started_ns is None:
+            self.started_ns = now_ns() if now is None else now
+
+    def pause(self, now=None):
+        if self.started_ns is not None:
+            now = now_ns() if now is None else now
+            self.accumulated_ns += now - self.started_ns
+            self.started_ns = None
+
+    def reset(self, now=None):
+        """Обнулить; если шёл — продолжает идти с нуля."""
+        self.accumulated_ns = 0
+        if self.started_ns is not None:
+            self.started_ns = now_ns() if now is None else now
+
+    def elapsed_ns(self, now=None):
+        if self.started_ns is None:
+            return self.accumulated_ns
+        now = now_ns() if now is None else now
+        return self.accumulated_ns + (now - self.started_ns)
+
+
+class Countdown:
+    """Обратный отсчёт: оставшееся = длительность − прошедшее."""
+
+    def __init__(self, duration_ns=0):
+        self.duration_ns = duration_ns
+        self.span = Span()
+
+    @property
+    def running(self):
+        return self.span.running
+
+    def set(self, duration_ns):
+        self.duration_ns = duration_ns
+        self.span = Span()
+
+    def start(self, now=None):
+        self.span.start(now)
+
+    def pause(self, now=None):
+        self.span.pause(now)
+
+    def remaining_ns(self, now=None):
+        return max(self.duration_ns - self.span.elapsed_ns(now), 0)
+
+    def deadline_ns(self):
+        """Момент (по now_ns) окончания отсчёта или None на паузе."""
+        if not self.span.running:
+            return None
+        return (self.span.started_ns + self.duration_ns -
+                self.span.accumulated_ns)
+
+
+def format_duration(ns, digits=0):
+    """ЧЧ:ММ:СС, с digits=2 — ещё сотые, с digits=3 — тысячные.
+
+    Дробная часть отбрасывается (не округляется), чтобы секунды на
+    экране сменялись ровно в момент, когда они прошли.
+    """
+    total, frac = divmod(max(ns, 0), NS_PER_SEC)
+    h, rest = divmod(total, 3600)
+    m, s = divmod(rest, 60)
+    text = f"{h:02d}:{m:02d}:{s:02d}"
+    if digits:
+        text += f".{frac // 10 ** (9 - digits):0{digits}d}"
+    return text
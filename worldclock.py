@@ -0,0 +1,126 @@
+"""Часовые пояса для стены мировых часов.
+
+Смещение каждой зоны от UTC считается через ``zoneinfo`` один раз и
+запоминается вместе с моментом следующего перехода (летнее/зимнее
+время). До этого момента местное время зоны — просто
+``(utc + смещение) % сутки``, без datetime на каждом кадре; после —
+пересчитываются только зоны, у которых переход наступил.
+"""
+
+import datetime
+import math
+import os
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError, available_timezones
+
+DAY = 86400
+
+# Шаг поиска перехода: переходы бывают не чаще пары раз в год, а между
+# двумя пробами точный момент находится бинарным поиском
+PROBE_STEP = 7 * DAY
+HORIZON = 366 * DAY
+
+DEFAULT_ZONES = (
+    "America/Los_Angeles", "America/Denver", "America/Chicago",
+    "America/New_York", "America/Sao_Paulo", "Atlantic/Reykjavik",
+    "Europe/London", "Europe/Paris", "Europe/Berlin", "Europe/Kyiv",
+    "Europe/Moscow", "Asia/Dubai", "Asia/Karachi", "Asia/Kolkata",
+    "Asia/Dhaka", "Asia/Bangkok", "Asia/Shanghai", "Asia/Singapore",
+    "Asia/Tokyo", "Australia/Sydney", "Pacific/Auckland",
+    "Pacific/Honolulu", "America/Anchorage", "Africa/Johannesburg",
+)
+
+
+def offset_at(tz, ts):
+    """Смещение зоны tz от UTC в момент ts (секунды)."""
+    return datetime.datetime.fromtimestamp(ts, tz).utcoffset().total_seconds()
+
+
+def next_transition(tz, after_ts):
+    """Момент (целые секунды) следующей смены смещения после after_ts.
+
+    Если в пределах HORIZON смены нет — HORIZON спустя (перепроверим).
+    """
+    start = math.floor(after_ts)
+    offset = offset_at(tz, start)
+    lo = start
+    while lo < start + HORIZON:
+        hi = lo + PROBE_STEP
+        if offset_at(tz, hi) != offset:
+            while hi - lo > 1:
+                mid = (lo + hi) // 2
+                if offset_at(tz, mid) == offset:
+                    lo = mid
+                else:
+                    hi = mid
+            return hi
+        lo = hi
+    return start + HORIZON
+
+
+def zone_label(name):
+    """«America/New_York» -> «New York»."""
+    return name.rsplit("/", 1)[-1].replace("_", " ")
+
+
+def parse_zones(spec):
+    """Список зон: «all», путь к файлу (по зоне в строке) или через запятую."""
+    if not spec:
+        return list(DEFAULT_ZONES)
+    if spec == "all":
+        # Только «Область/Город»: без псевдонимов вроде «EST» и «Etc/GMT+3»
+        return sorted(
+            name for name in available_timezones()
+            if "/" in name and not name.startswith(("Etc/", "SystemV/"))
+        )
+    if os.path.exists(spec):
+        with open(spec, encoding="utf-8") as f:
+            return [line.strip() for line in f
+                    if line.strip() and not line.startswith("#")]
+    return [name.strip() for name in spec.split(",") if name.strip()]
+
+
+def check_zones(names):
+    """ValueError со списком неизвестных зон — сразу при запуске, а не
+    при первой раскладке карточки W."""
+    unknown = []
+    for name in names:
+        try:
+            ZoneInfo(name)
+        except (ZoneInfoNotFoundError, ValueError):
+            unknown.append(name)
+    if unknown:
+        raise ValueError("неизвестные часовые пояса: " + ", ".join(unknown))
+    return names
+
+
+class ZoneTable:
+    """Смещения набора зон, действительные до ближайшего перехода."""
+
+    def __init__(self, names, now_ts=None):
+        self.names = list(names)
+        self.labels = [zone_label(name) for name in self.names]
+        self.zones = [ZoneInfo(name) for name in self.names]
+        self.offsets = [0.0] * len(self.zones)
+        self.valid_until = [0] * len(self.zones)
+        self.next_change = 0
+        self.refresh(datetime.datetime.now().timestamp()
+                     if now_ts is None else now_ts)
+
+    def __len__(self):
+        return len(self.zones)
+
+    def refresh(self, now_ts):
+        """Пересчитать зоны, у которых наступил переход; True — если были."""
+        if now_ts < self.next_change:
+            return False
+        for i, tz in enumerate(self.zones):
+            if now_ts >= self.valid_until[i]:
+                self.offsets[i] = offset_at(tz, now_ts)
+                self.valid_until[i] = next_transition(tz, now_ts)
+        self.next_change = min(self.valid_until, default=math.inf)
+        return True
+
+    def seconds_of_day(self, now_ts):
+        """Местное время каждой зоны — секунды с полуночи."""
+        self.refresh(now_ts)
+        return [(now_ts + offset) % DAY for offset in self.offsets]